@@ -8,17 +8,29 @@ Run 'python baseline.py --help' for usage information.
 import os
 import sys
 import argparse
-from rich.console import Console
 
 # Add project root to path to allow imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from __version__ import __version__, __title__, __description__
 
-console = Console()
+_console = None
+
+def _get_console():
+    """Create the Rich console on first use so --version and --help don't import Rich."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
 
 def main():
     """Main CLI entry point with subcommands."""
+    # Answer a bare --version without building the parser
+    if sys.argv[1:] == ['--version']:
+        print(f'{__title__} v{__version__}')
+        return
+    
     parser = argparse.ArgumentParser(
         prog='baseline-cli',
         description=__description__,
@@ -27,7 +39,10 @@ def main():
 Examples:
   {sys.argv[0]} capture --url http://localhost:3000 --name homepage --page
   {sys.argv[0]} capture --url http://localhost:3000 --name button --element --selector "button"
+  {sys.argv[0]} capture --batch manifest.json --workers 4
   {sys.argv[0]} compare --url http://localhost:3000 --name homepage --page
+  {sys.argv[0]} compare --batch manifest.json --workers 4
+  {sys.argv[0]} daemon start
   {sys.argv[0]} --version
 
 For more help on a specific command:
@@ -54,12 +69,17 @@ For more help on a specific command:
         help='Capture baseline screenshots',
         description='Capture baseline screenshots of web pages or elements'
     )
-    capture_parser.add_argument('--url', type=str, required=True, help='URL to navigate to')
-    capture_parser.add_argument('--name', type=str, required=True, help='Name for the baseline/template')
+    capture_parser.add_argument('--url', type=str, help='URL to navigate to (required unless --batch is used)')
+    capture_parser.add_argument('--name', type=str, help='Name for the baseline/template (required unless --batch is used)')
     
     capture_group = capture_parser.add_mutually_exclusive_group(required=True)
     capture_group.add_argument('--page', action='store_true', help='Capture full page screenshot')
     capture_group.add_argument('--element', action='store_true', help='Capture element template')
+    capture_group.add_argument('--batch', type=str, metavar='MANIFEST', help='Capture every job in a JSON manifest using one browser session')
+    
+    capture_parser.add_argument('--workers', type=int, default=1, help='Number of browsers to run --batch jobs on in parallel (default: 1)')
+    
+    capture_parser.add_argument('--no-spinner', action='store_true', help='Print progress without animated spinners')
     
     element_group = capture_parser.add_mutually_exclusive_group()
     element_group.add_argument('--class', dest='class_name', type=str, help='Class name for the element (required with --element)')
@@ -71,17 +91,30 @@ For more help on a specific command:
         help='Compare against baseline images',
         description='Compare current screenshots against baseline images'
     )
-    compare_parser.add_argument('--url', type=str, required=True, help='URL to test')
-    compare_parser.add_argument('--name', type=str, required=True, help='Name of the baseline image (without extension)')
+    compare_parser.add_argument('--url', type=str, help='URL to test (required unless --batch is used)')
+    compare_parser.add_argument('--name', type=str, help='Name of the baseline image without extension (required unless --batch is used)')
     
     compare_group = compare_parser.add_mutually_exclusive_group()
     compare_group.add_argument('--page', action='store_true', help='Compare full page screenshot (default)')
     compare_group.add_argument('--element', action='store_true', help='Compare element screenshot')
+    compare_group.add_argument('--batch', type=str, metavar='MANIFEST', help='Compare every job in a JSON manifest using one browser session')
+    
+    compare_parser.add_argument('--workers', type=int, default=1, help='Number of browsers to run --batch jobs on in parallel (default: 1)')
+    
+    compare_parser.add_argument('--no-spinner', action='store_true', help='Print progress without animated spinners')
     
     compare_element_group = compare_parser.add_mutually_exclusive_group()
     compare_element_group.add_argument('--class', dest='class_name', type=str, help='Class name for the element (used with --element)')
     compare_element_group.add_argument('--selector', dest='css_selector', type=str, help='CSS selector for the element (used with --element)')
     
+    # Daemon subcommand
+    daemon_parser = subparsers.add_parser(
+        'daemon',
+        help='Manage the background browser daemon',
+        description='Start or stop a long-lived browser that capture and compare reuse between runs'
+    )
+    daemon_parser.add_argument('action', choices=['start', 'stop', 'status'], help='Daemon action to perform')
+    
     args = parser.parse_args()
     
     # If no command specified, show help
@@ -89,45 +122,111 @@ For more help on a specific command:
         parser.print_help()
         return
     
+    if getattr(args, 'no_spinner', False):
+        from utils.error_utils import disable_spinners
+        disable_spinners()
+    
     # Import and execute the appropriate command
     if args.command == 'capture':
-        from scripts.capture import capture_full_page_baseline, capture_element_template
-        from utils.web_utils import create_driver
-        from utils.error_utils import handle_cli_error, display_success_summary
-        from config.config import HEADLESS, BASELINE_DIR
+        # --url and --name are only optional when a manifest supplies them
+        if not args.batch:
+            missing = [flag for flag, value in (('--url', args.url), ('--name', args.name)) if not value]
+            if missing:
+                capture_parser.error(f"the following arguments are required: {', '.join(missing)}")
+        if args.workers < 1:
+            capture_parser.error("--workers must be at least 1")
+        
+        from scripts.capture import capture_full_page_baseline, capture_element_template, capture_batch, capture_batch_parallel
+        from utils.web_utils import create_driver, release_driver, DriverPool, wait_for_screenshot_writes
+        from utils.batch_utils import load_manifest
+        from utils.error_utils import handle_cli_error, handle_multiple_cli_errors, display_success_summary, display_batch_summary
+        from config.config import HEADLESS, ELEMENT_BLOCK_IMAGES, ensure_dirs
         from selenium.webdriver.common.by import By
         
         # Validate element-specific arguments
         if args.element and not args.class_name and not args.css_selector:
             handle_cli_error("You must provide either --class or --selector for --element", operation_type="capture")
         
-        os.makedirs(BASELINE_DIR, exist_ok=True)
-        driver = create_driver(headless=HEADLESS)
+        if args.batch:
+            try:
+                jobs = load_manifest(args.batch)
+            except (FileNotFoundError, ValueError) as e:
+                handle_cli_error(str(e), operation_type="capture")
         
-        try:
-            if args.page:
-                result, output_path, duration = capture_full_page_baseline(args.url, args.name, driver, should_quit=False)
-            elif args.element:
-                if args.class_name:
-                    result, output_path, duration = capture_element_template(args.url, args.class_name, args.name, selector_type=By.CLASS_NAME, driver=driver, should_quit=False)
-                elif args.css_selector:
-                    result, output_path, duration = capture_element_template(args.url, args.css_selector, args.name, selector_type=By.CSS_SELECTOR, driver=driver, should_quit=False)
-        finally:
-            driver.quit()
+        ensure_dirs()
+        
+        if args.batch and args.workers > 1:
+            driver_pool = DriverPool(min(args.workers, len(jobs)), headless=HEADLESS)
+            try:
+                results, duration = capture_batch_parallel(jobs, driver_pool)
+            finally:
+                driver_pool.close()
+        else:
+            # Batch jobs share one browser, so only a lone element capture can skip images
+            driver = create_driver(headless=HEADLESS, block_images=args.element and ELEMENT_BLOCK_IMAGES)
+            try:
+                if args.batch:
+                    results, duration = capture_batch(jobs, driver)
+                elif args.page:
+                    result, output_path, duration = capture_full_page_baseline(args.url, args.name, driver, should_quit=False)
+                elif args.element:
+                    if args.class_name:
+                        result, output_path, duration = capture_element_template(args.url, args.class_name, args.name, selector_type=By.CLASS_NAME, driver=driver, should_quit=False)
+                    elif args.css_selector:
+                        result, output_path, duration = capture_element_template(args.url, args.css_selector, args.name, selector_type=By.CSS_SELECTOR, driver=driver, should_quit=False)
+            finally:
+                release_driver(driver)
+        
+        # Screenshots are flushed in the background; make sure they're on disk
+        write_errors = wait_for_screenshot_writes()
+        if write_errors:
+            handle_multiple_cli_errors(write_errors, operation_type="capture", duration=duration, result="Error")
             
         # Display results using consolidated success summary
-        display_success_summary(result, duration, operation_type="capture")
+        if args.batch:
+            display_batch_summary(results, duration, operation_type="capture")
+        else:
+            display_success_summary(result, duration, operation_type="capture")
     
     elif args.command == 'compare':
-        from scripts.compare import compare_website_visuals
-        from utils.error_utils import handle_cli_error, display_success_summary
+        # --url and --name are only optional when a manifest supplies them
+        if not args.batch:
+            missing = [flag for flag, value in (('--url', args.url), ('--name', args.name)) if not value]
+            if missing:
+                compare_parser.error(f"the following arguments are required: {', '.join(missing)}")
+        if args.workers < 1:
+            compare_parser.error("--workers must be at least 1")
+        
+        from scripts.compare import compare_website_visuals, compare_batch, compare_batch_parallel
+        from utils.batch_utils import load_manifest
+        from utils.error_utils import handle_cli_error, handle_multiple_cli_errors, display_success_summary, display_batch_summary
         
         # Validate element-specific arguments
         if args.element and not args.class_name and not args.css_selector:
             handle_cli_error("You must provide either --class or --selector for --element", operation_type="compare")
         
         # Execute comparison
-        if args.element:
+        if args.batch:
+            try:
+                jobs = load_manifest(args.batch)
+            except (FileNotFoundError, ValueError) as e:
+                handle_cli_error(str(e), operation_type="compare")
+            
+            from utils.web_utils import create_driver, release_driver, DriverPool
+            from config.config import HEADLESS
+            if args.workers > 1:
+                driver_pool = DriverPool(min(args.workers, len(jobs)), headless=HEADLESS)
+                try:
+                    results, duration = compare_batch_parallel(jobs, driver_pool)
+                finally:
+                    driver_pool.close()
+            else:
+                driver = create_driver(headless=HEADLESS)
+                try:
+                    results, duration = compare_batch(jobs, driver)
+                finally:
+                    release_driver(driver)
+        elif args.element:
             result, similarity_score, duration = compare_website_visuals(
                 args.url, args.name, 
                 compare_element=True, 
@@ -140,8 +239,40 @@ For more help on a specific command:
                 compare_element=False
             )
         
+        # The current screenshot is saved in the background; make sure it's on disk
+        from utils.web_utils import wait_for_screenshot_writes
+        write_errors = wait_for_screenshot_writes()
+        if write_errors:
+            handle_multiple_cli_errors(write_errors, operation_type="compare", duration=duration, result="Error")
+        
         # Display results using consolidated success summary
-        display_success_summary(result, duration, similarity_score, operation_type="compare")
+        if args.batch:
+            display_batch_summary(results, duration, operation_type="compare")
+        else:
+            display_success_summary(result, duration, similarity_score, operation_type="compare")
+    
+    elif args.command == 'daemon':
+        from utils.daemon_utils import start_daemon, stop_daemon, get_daemon_address
+        console = _get_console()
+        
+        if args.action == 'start':
+            try:
+                endpoint = start_daemon()
+            except (FileNotFoundError, RuntimeError, TimeoutError) as e:
+                console.print(f"[bold red]{e}")
+                sys.exit(1)
+            console.print(f"Browser daemon running at {endpoint}")
+        elif args.action == 'stop':
+            if stop_daemon():
+                console.print("Browser daemon stopped")
+            else:
+                console.print("No browser daemon is running")
+        else:
+            address = get_daemon_address()
+            if address:
+                console.print(f"Browser daemon running at {address}")
+            else:
+                console.print("No browser daemon is running")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -11,6 +11,18 @@ DEFAULT_BROWSER = "chrome"  # Options: chrome, firefox, edge
 HEADLESS = True  # Run browser in headless mode
 WINDOW_SIZE = (1920, 1080)
 
+# Browser daemon settings (see `baseline.py daemon`)
+DAEMON_DIR = os.path.join(os.path.expanduser("~"), ".baseline-cli")
+DAEMON_ENDPOINT_FILE = os.path.join(DAEMON_DIR, "endpoint")
+DAEMON_PID_FILE = os.path.join(DAEMON_DIR, "daemon.pid")
+DRIVER_CACHE_FILE = os.path.join(DAEMON_DIR, "driver.json")  # Resolved ChromeDriver path
+DAEMON_PORT = 9222  # Chrome remote debugging port
+CHROME_BINARY = None  # Path to Chrome; None auto-detects a local install
+
+# When driver.get returns: "normal" (load event), "eager" (DOMContentLoaded) or "none".
+# wait_for_page_load_complete still waits for the full load before screenshots.
+PAGE_LOAD_STRATEGY = "normal"
+
 # Timeouts (in seconds)
 DEFAULT_TIMEOUT = 10
 PAGE_LOAD_TIMEOUT = 30
@@ -21,14 +33,24 @@ SCREENSHOT_DIR = os.path.join(BASE_DIR, "screenshots")
 BASELINE_DIR = os.path.join(SCREENSHOT_DIR, "baseline")
 RESULTS_DIR = os.path.join(SCREENSHOT_DIR, "results")
 DIFF_DIR = os.path.join(SCREENSHOT_DIR, "diff")
+IMAGE_FORMAT = "png"  # Baseline format: "png" or "webp" (lossless, faster to decode)
+ELEMENT_BLOCK_IMAGES = False  # Skip loading images for single --element capture/compare runs
 
 # Image comparison settings
 SIMILARITY_THRESHOLD = 0.95  # Threshold for image comparison (0.0 to 1.0)
 TEMPLATE_MATCH_THRESHOLD = 0.8  # Threshold for template matching
-
-# Ensure directories exist
-for directory in [SCREENSHOT_DIR, BASELINE_DIR, RESULTS_DIR, DIFF_DIR]:
-    os.makedirs(directory, exist_ok=True)
+USE_OPENCL = False  # Run SSIM and template matching through OpenCL (cv2.UMat) when a device is available
+
+_dirs_ready = False
+
+def ensure_dirs():
+    """Create the screenshot directories once per process; called by the commands that write to them."""
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    for directory in (SCREENSHOT_DIR, BASELINE_DIR, RESULTS_DIR, DIFF_DIR):
+        os.makedirs(directory, exist_ok=True)
+    _dirs_ready = True
 
 
 # Web app settings
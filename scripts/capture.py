@@ -1,23 +1,22 @@
 """
-Script to capture baseline screenshots and element templates.
+Capture baseline screenshots and element templates.
 
-This tool helps create initial reference images for visual regression testing.
+This module helps create initial reference images for visual regression testing.
+Run it through the unified CLI: 'python baseline.py capture --help'.
 """
 import os
 import sys
 import time
-import argparse
-from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from rich.console import Console
 
 # Add project root to path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.web_utils import create_driver, take_screenshot
-from utils.error_utils import handle_cli_error, display_success_summary
-from config.config import TARGET_URL, BASELINE_DIR, HEADLESS
-from __version__ import __version__, __title__, __description__
+from utils.web_utils import get_driver, release_driver, clear_browser_state, take_screenshot, save_image, wait_for_page_load_complete, scroll_to_element, wait_for_element_visible
+from utils.error_utils import console_status
+from config.config import BASELINE_DIR, HEADLESS, PAGE_LOAD_TIMEOUT, IMAGE_FORMAT
 
 console = Console()
 
@@ -28,25 +27,26 @@ def capture_full_page_baseline(url, name, driver=None, should_quit=True):
     Args:
         url (str): URL to navigate to
         name (str): Name to use for the baseline image
-        driver (WebDriver, optional): Existing driver to use
+        driver (WebDriver, optional): Existing driver to use; defaults to
+            the shared driver from `get_driver`
         should_quit (bool): Whether to quit the driver when done
     """
     if driver is None:
-        driver = create_driver(headless=HEADLESS)
+        driver = get_driver(headless=HEADLESS)
     start_time = time.time()
     output_path = None
     try:
         console.print()
-        with console.status("Visiting {}".format(url), spinner="dots", spinner_style="white"):
+        with console_status("Visiting {}".format(url)):
             driver.get(url)
-            time.sleep(3)
+            wait_for_page_load_complete(driver, timeout=PAGE_LOAD_TIMEOUT)
         console.print("Visited URL")
-        with console.status("Capturing screenshot", spinner="dots", spinner_style="white"):
-            filename = f"{name}_baseline.png"
-            baseline_path = take_screenshot(driver, filename=filename, folder=BASELINE_DIR)
+        with console_status("Capturing screenshot"):
+            filename = f"{name}_baseline.{IMAGE_FORMAT}"
+            baseline_path = take_screenshot(driver, filename=filename, folder=BASELINE_DIR, wait=False, image_format=IMAGE_FORMAT)
             output_path = baseline_path
         console.print("Screenshot captured")
-        with console.status("Compiling results", spinner="dots", spinner_style="white"):
+        with console_status("Compiling results"):
             duration = time.time() - start_time
             # No real work here, but keep for consistency
         console.print("Results compiled")
@@ -61,7 +61,7 @@ def capture_full_page_baseline(url, name, driver=None, should_quit=True):
         return "Error", output_path, duration
     finally:
         if should_quit:
-            driver.quit()
+            release_driver(driver)
 
 
 def capture_element_template(url, element_selector, name, selector_type=By.CSS_SELECTOR, driver=None, should_quit=True):
@@ -73,45 +73,30 @@ def capture_element_template(url, element_selector, name, selector_type=By.CSS_S
         element_selector (str): Selector to locate the element
         name (str): Name to use for the template image
         selector_type (By): Type of selector to use
-        driver (WebDriver, optional): Existing driver to use
+        driver (WebDriver, optional): Existing driver to use; defaults to
+            the shared driver from `get_driver`
         should_quit (bool): Whether to quit the driver when done
     """
     if driver is None:
-        driver = create_driver(headless=HEADLESS)
+        driver = get_driver(headless=HEADLESS)
     start_time = time.time()
     output_path = None
     try:
         console.print()
-        with console.status(f"Visiting {url}", spinner="dots", spinner_style="white"):
+        with console_status(f"Visiting {url}"):
             driver.get(url)
-            time.sleep(3)
+            wait_for_page_load_complete(driver, timeout=PAGE_LOAD_TIMEOUT)
         console.print("Visited URL")
-        with console.status("Capturing element screenshot", spinner="dots", spinner_style="white"):
+        with console_status("Capturing element screenshot"):
             element = driver.find_element(selector_type, element_selector)
-            driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            time.sleep(1)
-            location = element.location
-            size = element.size
-            temp_screenshot = os.path.join(BASELINE_DIR, "temp_screenshot.png")
-            driver.save_screenshot(temp_screenshot)
-            full_img = Image.open(temp_screenshot)
-            left = location['x']
-            top = location['y']
-            right = location['x'] + size['width']
-            bottom = location['y'] + size['height']
-            device_pixel_ratio = driver.execute_script("return window.devicePixelRatio;")
-            if device_pixel_ratio and device_pixel_ratio > 1:
-                left *= device_pixel_ratio
-                top *= device_pixel_ratio
-                right *= device_pixel_ratio
-                bottom *= device_pixel_ratio
-            elem_img = full_img.crop((left, top, right, bottom))
-            template_path = os.path.join(BASELINE_DIR, f"{name}_element.png")
-            elem_img.save(template_path)
-            os.remove(temp_screenshot)
+            scroll_to_element(driver, element)
+            wait_for_element_visible(driver, element)
+            template_path = os.path.join(BASELINE_DIR, f"{name}_element.{IMAGE_FORMAT}")
+            # Selenium captures just the element's box, already scaled for devicePixelRatio
+            save_image(element.screenshot_as_png, template_path, wait=False, image_format=IMAGE_FORMAT)
             output_path = template_path
         console.print("Element screenshot captured")
-        with console.status("Compiling results", spinner="dots", spinner_style="white"):
+        with console_status("Compiling results"):
             duration = time.time() - start_time
         console.print("Results compiled")
         return "Success", template_path, duration
@@ -125,69 +110,70 @@ def capture_element_template(url, element_selector, name, selector_type=By.CSS_S
         return "Error", output_path, duration
     finally:
         if should_quit:
-            driver.quit()
+            release_driver(driver)
 
 
-def main():
-    """Run the baseline capture tool."""
-    parser = argparse.ArgumentParser(description="Capture baseline screenshots and templates")
-    parser.add_argument("--url", type=str, nargs='?', help="URL to navigate to")
-    parser.add_argument("--page", action="store_true", help="Capture full page screenshot")
-    parser.add_argument("--element", action="store_true", help="Capture element template")
-    parser.add_argument("--name", type=str, nargs='?', help="Name for the baseline/template")
-    # Add mutually exclusive group for --class and --selector
-    group = parser.add_mutually_exclusive_group()
-    group.add_argument("--class", dest="class_name", type=str, nargs='?', const='', help="Class name for the element (required for --element if not using --selector)")
-    group.add_argument("--selector", dest="css_selector", type=str, nargs='?', const='', help="Generic CSS selector for the element (required for --element if not using --class)")
-    parser.add_argument("--version", action="store_true", help="Show version information")
-    args = parser.parse_args()
-    
-    # Handle version request first, before any other validation
-    if args.version:
-        console.print(f"[bold green]{__title__}[/bold green] v{__version__}")
-        console.print(f"[dim]{__description__}[/dim]")
-        sys.exit(0)
+def capture_job(job, driver):
+    """
+    Run a single batch manifest job.
     
-    os.makedirs(BASELINE_DIR, exist_ok=True)
+    Args:
+        job (dict): Manifest job with "url", "name", "mode" and, for element
+            jobs, "selector" or "class"
+        driver (WebDriver): Driver to capture with; left running afterwards
+        
+    Returns:
+        tuple: (result, output_path, duration)
+    """
+    if job["mode"] == "page":
+        return capture_full_page_baseline(job["url"], job["name"], driver, should_quit=False)
+    if job.get("class"):
+        return capture_element_template(job["url"], job["class"], job["name"], selector_type=By.CLASS_NAME, driver=driver, should_quit=False)
+    return capture_element_template(job["url"], job["selector"], job["name"], selector_type=By.CSS_SELECTOR, driver=driver, should_quit=False)
 
-    # Validate required arguments using consolidated error handling
-    if '--name' in sys.argv and args.name is None:
-        handle_cli_error("Baseline name not provided", operation_type="capture")
-    if '--name' not in sys.argv:
-        handle_cli_error("The --name arg was not provided", operation_type="capture")
-    if '--url' in sys.argv and (args.url is None or args.url.startswith('--')):
-        handle_cli_error("URL not provided", operation_type="capture")
-    if '--url' not in sys.argv:
-        handle_cli_error("The --url arg was not provided", operation_type="capture")
 
-    if args.page and args.element:
-        handle_cli_error("Please choose either --page or --element, not both.", operation_type="capture")
-    
-    driver = create_driver(headless=HEADLESS)
-    try:
-        if args.page:
-            result, output_path, duration = capture_full_page_baseline(args.url, args.name, driver, should_quit=False)
-        elif args.element:
-            # Support --class or --selector for element selection
-            if args.class_name == '':
-                handle_cli_error("Class not provided", operation_type="capture")
-            if args.css_selector == '':
-                handle_cli_error("Selector not provided", operation_type="capture")
-            if args.class_name is None and args.css_selector is None:
-                handle_cli_error("You must provide either --class or --selector for --element", operation_type="capture")
-            if args.class_name:
-                result, output_path, duration = capture_element_template(args.url, args.class_name, args.name, selector_type=By.CLASS_NAME, driver=driver, should_quit=False)
-            elif args.css_selector:
-                result, output_path, duration = capture_element_template(args.url, args.css_selector, args.name, selector_type=By.CSS_SELECTOR, driver=driver, should_quit=False)
-        else:
-            # Consistent error output for missing --page/--element
-            handle_cli_error("The --page or --element arg was not provided", operation_type="capture")
-    finally:
-        driver.quit()
+def capture_batch(jobs, driver):
+    """
+    Capture every job in a batch manifest using a single driver.
     
-    # Display results using consolidated success summary
-    display_success_summary(result, duration, operation_type="capture")
+    Args:
+        jobs (list): Manifest jobs as returned by `load_manifest`
+        driver (WebDriver): Driver shared by all jobs; left running afterwards
+        
+    Returns:
+        tuple: (results, duration) where results holds one dict per job
+    """
+    start_time = time.time()
+    results = []
+    for job in jobs:
+        result, output_path, duration = capture_job(job, driver)
+        results.append({"name": job["name"], "result": result, "duration": duration})
+        if result == "Cancelled":
+            break
+        # Keep jobs isolated from each other, as if run in separate sessions
+        clear_browser_state(driver)
+    return results, time.time() - start_time
 
 
-if __name__ == "__main__":
-    main() 
\ No newline at end of file
+def capture_batch_parallel(jobs, driver_pool):
+    """
+    Capture the jobs in a batch manifest concurrently across a driver pool.
+    
+    Args:
+        jobs (list): Manifest jobs as returned by `load_manifest`
+        driver_pool (DriverPool): Pool whose drivers are shared by the jobs
+        
+    Returns:
+        tuple: (results, duration) where results holds one dict per job,
+            in manifest order
+    """
+    def run(job):
+        with driver_pool.acquire() as driver:
+            result, output_path, duration = capture_job(job, driver)
+            clear_browser_state(driver)
+        return {"name": job["name"], "result": result, "duration": duration}
+    
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=driver_pool.size) as executor:
+        results = list(executor.map(run, jobs))
+    return results, time.time() - start_time
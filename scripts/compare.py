@@ -1,52 +1,46 @@
 """
-Script to compare screenshots against baseline images for visual regression testing.
+Compare screenshots against baseline images for visual regression testing.
 
-This tool captures new screenshots and compares them with existing baselines.
+This module captures new screenshots and compares them with existing baselines.
+Run it through the unified CLI: 'python baseline.py compare --help'.
 """
 import os
 import sys
-import argparse
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
 import time
-import cv2
-import numpy as np
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
-from PIL import Image
-from selenium.webdriver.common.by import By
 
 # Add project root to path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.web_utils import take_screenshot, wait_for_page_load_complete, create_driver
-from utils.image_utils import compare_images
-from utils.error_utils import handle_cli_error, handle_multiple_cli_errors, format_function_error, display_success_summary
+from utils.error_utils import format_function_error, console_status
 from config.config import (
     BASELINE_DIR, 
     RESULTS_DIR, 
     DIFF_DIR, 
     SIMILARITY_THRESHOLD,
     HEADLESS,
-    TARGET_URL
+    IMAGE_FORMAT,
+    ELEMENT_BLOCK_IMAGES,
+    ensure_dirs
 )
-from __version__ import __version__, __title__, __description__
 
 console = Console()
 
-def parse_args():
-    parser = argparse.ArgumentParser(description='Run visual comparison test')
-    parser.add_argument('--url', type=str, nargs='?', default=None, help='URL to test')
-    parser.add_argument('--name', type=str, nargs='?', default=None, help='Name of the baseline image (without extension)')
-    group = parser.add_mutually_exclusive_group()
-    group.add_argument('--page', action='store_true', help='Compare full page screenshot (default)')
-    group.add_argument('--element', action='store_true', help='Compare element screenshot')
-    parser.add_argument('--class', dest='class_name', type=str, nargs='?', help='Class name for the element (used with --element)')
-    parser.add_argument('--selector', dest='css_selector', type=str, nargs='?', help='CSS selector for the element (used with --element)')
-    parser.add_argument("--version", action="store_true", help="Show version information")
-    return parser.parse_args()
+# Decodes baselines while the browser is busy loading the page
+_decode_pool = None
+_decode_pool_lock = threading.Lock()
 
-def compare_website_visuals(url, baseline_name, compare_element=False, class_name=None, css_selector=None):
+def _get_decode_pool():
+    """Create the baseline decode pool on first use, so importing the module doesn't."""
+    global _decode_pool
+    with _decode_pool_lock:
+        if _decode_pool is None:
+            _decode_pool = ThreadPoolExecutor(max_workers=2)
+        return _decode_pool
+
+def compare_website_visuals(url, baseline_name, compare_element=False, class_name=None, css_selector=None, driver=None, should_quit=True):
     """
     Test a website by comparing its current state with a baseline or element image.
     Args:
@@ -55,86 +49,84 @@ def compare_website_visuals(url, baseline_name, compare_element=False, class_nam
         compare_element (bool): Whether to compare element image
         class_name (str): Class name for the element (if used)
         css_selector (str): CSS selector for the element (if used)
+        driver (WebDriver, optional): Existing driver to use; defaults to
+            the shared driver from `get_driver`
+        should_quit (bool): Whether to release the driver when done
     Returns:
         tuple: (result, similarity_score, duration)
     """
     start_time = time.time()
+    # Element results get their own names, so a page and an element
+    # comparison of the same name don't overwrite each other's images
     if compare_element:
-        baseline_path = os.path.join(BASELINE_DIR, f"{baseline_name}_element.png")
+        baseline_path = os.path.join(BASELINE_DIR, f"{baseline_name}_element.{IMAGE_FORMAT}")
+        output_name = f"{baseline_name}_element"
     else:
-        baseline_path = os.path.join(BASELINE_DIR, f"{baseline_name}_baseline.png")
+        baseline_path = os.path.join(BASELINE_DIR, f"{baseline_name}_baseline.{IMAGE_FORMAT}")
+        output_name = baseline_name
     if not os.path.exists(baseline_path):
         duration = time.time() - start_time
         return format_function_error("Image not found", duration)
+    
+    # Selenium and OpenCV are only imported once there's something to compare,
+    # so --version and argument errors don't pay for them
+    import cv2
+    from selenium.webdriver.common.by import By
+    from utils.web_utils import get_screenshot_png, save_image, wait_for_page_load_complete, scroll_to_element, wait_for_element_visible, get_driver, release_driver
+    from utils.image_utils import compare_image_bytes, load_baseline_image
+    
+    # Only the grayscale baseline is compared; the colour one is only
+    # decoded if a difference image has to be drawn
+    baseline_gray_future = _get_decode_pool().submit(load_baseline_image, baseline_path, grayscale=True)
     try:
-        # Ensure the results and diff directories exist
-        os.makedirs(RESULTS_DIR, exist_ok=True)
-        os.makedirs(DIFF_DIR, exist_ok=True)
-        chromedriver_path = ChromeDriverManager().install()
-        if "THIRD_PARTY_NOTICES" in chromedriver_path:
-            driver_dir = os.path.dirname(chromedriver_path)
-            chromedriver_path = os.path.join(driver_dir, "chromedriver")
-        os.chmod(chromedriver_path, 0o755)
-        options = webdriver.ChromeOptions()
-        if HEADLESS:
-            options.add_argument("--headless=new")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--no-sandbox")
-        service = ChromeService(chromedriver_path)
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.set_page_load_timeout(30)
+        ensure_dirs()
+        if driver is None:
+            driver = get_driver(headless=HEADLESS, block_images=compare_element and ELEMENT_BLOCK_IMAGES)
         try:
             console.print()
-            with console.status(f"Visiting {url}", spinner="dots", spinner_style="white"):
+            with console_status(f"Visiting {url}"):
                 driver.get(url)
                 wait_for_page_load_complete(driver)
             console.print("Visited URL")
-            with console.status("Capturing screenshot", spinner="dots", spinner_style="white"):
+            with console_status("Capturing screenshot"):
                 if compare_element:
                     # Find the element
                     if class_name:
                         element = driver.find_element(By.CLASS_NAME, class_name)
                     else:
                         element = driver.find_element(By.CSS_SELECTOR, css_selector)
-                    driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                    time.sleep(1)
-                    location = element.location
-                    size = element.size
-                    temp_screenshot = os.path.join(RESULTS_DIR, "temp_screenshot.png")
-                    driver.save_screenshot(temp_screenshot)
-                    full_img = Image.open(temp_screenshot)
-                    left = location['x']
-                    top = location['y']
-                    right = location['x'] + size['width']
-                    bottom = location['y'] + size['height']
-                    device_pixel_ratio = driver.execute_script("return window.devicePixelRatio;")
-                    if device_pixel_ratio and device_pixel_ratio > 1:
-                        left *= device_pixel_ratio
-                        top *= device_pixel_ratio
-                        right *= device_pixel_ratio
-                        bottom *= device_pixel_ratio
-                    elem_img = full_img.crop((left, top, right, bottom))
-                    current_path = os.path.join(RESULTS_DIR, "current.png")
-                    elem_img.save(current_path)
-                    os.remove(temp_screenshot)
+                    scroll_to_element(driver, element)
+                    wait_for_element_visible(driver, element)
+                    # Capture just the element's box, the same way element baselines are captured
+                    current_png = element.screenshot_as_png
                 else:
-                    current_path = take_screenshot(driver, "current.png", folder=RESULTS_DIR)
+                    current_png = get_screenshot_png(driver)
+                # Kept for inspection only; the comparison below works from memory
+                save_image(current_png, os.path.join(RESULTS_DIR, f"{output_name}_current.png"), wait=False)
             console.print("Screenshot captured")
-            with console.status("Comparing screenshots", spinner="dots", spinner_style="white"):
-                diff_path = os.path.join(DIFF_DIR, "diff.png")
-                similarity_score, _ = compare_images(
-                    current_path,
+            with console_status("Comparing screenshots"):
+                diff_path = os.path.join(DIFF_DIR, f"{output_name}_diff.png")
+                # Without an output path, the diff is only drawn for a failing comparison
+                similarity_score, diff_image = compare_image_bytes(
+                    current_png,
                     baseline_path,
-                    output_path=diff_path
+                    threshold=SIMILARITY_THRESHOLD,
+                    baseline_gray=baseline_gray_future.result()
                 )
+                if diff_image is not None:
+                    cv2.imwrite(diff_path, diff_image)
+                elif os.path.exists(diff_path):
+                    # Don't leave the diff from an earlier failure next to a passing result
+                    os.remove(diff_path)
             console.print("Screenshots compared")
-            with console.status("Compiling results", spinner="dots", spinner_style="white"):
+            with console_status("Compiling results"):
                 duration = time.time() - start_time
             console.print("Results compiled")
             result = "Success" if similarity_score >= SIMILARITY_THRESHOLD else "Failed"
             return result, similarity_score, duration
         finally:
-            driver.quit()
+            if should_quit:
+                release_driver(driver)
     except KeyboardInterrupt:
         duration = time.time() - start_time
         console.print("\n[bold yellow]Comparison cancelled by user.")
@@ -144,56 +136,72 @@ def compare_website_visuals(url, baseline_name, compare_element=False, class_nam
         console.print(f"\n[bold red]Error testing website: {str(e)}")
         return "Error", None, duration
 
-def main():
-    args = parse_args()
-    
-    # Handle version request first, before any other validation
-    if args.version:
-        console.print(f"[bold green]{__title__}[/bold green] v{__version__}")
-        console.print(f"[dim]{__description__}[/dim]")
-        sys.exit(0)
+def compare_job(job, driver):
+    """
+    Run a single batch manifest job.
     
-    # Check for --url provided but no value
-    if '--url' in sys.argv:
-        url_index = sys.argv.index('--url')
-        # If --url is last or next value is another flag or missing
-        if url_index == len(sys.argv) - 1 or (url_index + 1 < len(sys.argv) and sys.argv[url_index + 1].startswith('--')):
-            handle_cli_error("URL not provided", operation_type="compare")
-
-    # If neither --url nor --name are provided, show both errors
-    if not args.url and not args.name:
-        handle_multiple_cli_errors([
-            "The --url arg was not provided",
-            "The --name arg was not provided"
-        ], operation_type="compare")
+    Args:
+        job (dict): Manifest job with "url", "name", "mode" and, for element
+            jobs, "selector" or "class"
+        driver (WebDriver): Driver to compare with; left running afterwards
+        
+    Returns:
+        tuple: (result, similarity_score, duration)
+    """
+    return compare_website_visuals(
+        job["url"], job["name"],
+        compare_element=job["mode"] == "element",
+        class_name=job.get("class"),
+        css_selector=job.get("selector"),
+        driver=driver,
+        should_quit=False
+    )
 
-    if not args.url:
-        handle_cli_error("The --url arg was not provided", operation_type="compare")
+def compare_batch(jobs, driver):
+    """
+    Compare every job in a batch manifest using a single driver.
     
-    # Check for --name provided but no value
-    if '--name' in sys.argv:
-        name_index = sys.argv.index('--name')
-        # If --name is last or next value is another flag or missing
-        if name_index == len(sys.argv) - 1 or (name_index + 1 < len(sys.argv) and sys.argv[name_index + 1].startswith('--')):
-            handle_cli_error("Image name not provided", operation_type="compare")
-
-    if not args.name:
-        handle_cli_error("The --name arg was not provided", operation_type="compare")
-
-    # If --element is used, require --class or --selector
-    if args.element:
-        if not args.class_name and not args.css_selector:
-            handle_cli_error("You must provide either --class or --selector for --element", operation_type="compare")
-        if args.class_name == 'class':
-            handle_cli_error("No class name provided", operation_type="compare")
-        if args.css_selector == 'selector':
-            handle_cli_error("No CSS selector provided", operation_type="compare")
-        result, similarity_score, duration = compare_website_visuals(args.url, args.name, compare_element=True, class_name=args.class_name, css_selector=args.css_selector)
-    else:
-        result, similarity_score, duration = compare_website_visuals(args.url, args.name, compare_element=False)
+    Args:
+        jobs (list): Manifest jobs as returned by `load_manifest`
+        driver (WebDriver): Driver shared by all jobs; left running afterwards
+        
+    Returns:
+        tuple: (results, duration) where results holds one dict per job
+    """
+    from utils.web_utils import clear_browser_state
     
-    # Display results using consolidated success summary
-    display_success_summary(result, duration, similarity_score, operation_type="compare")
+    start_time = time.time()
+    results = []
+    for job in jobs:
+        result, similarity_score, duration = compare_job(job, driver)
+        results.append({"name": job["name"], "result": result, "duration": duration, "similarity_score": similarity_score})
+        if result == "Cancelled":
+            break
+        # Keep jobs isolated from each other, as if run in separate sessions
+        clear_browser_state(driver)
+    return results, time.time() - start_time
 
-if __name__ == "__main__":
-    main() 
\ No newline at end of file
+def compare_batch_parallel(jobs, driver_pool):
+    """
+    Compare the jobs in a batch manifest concurrently across a driver pool.
+    
+    Args:
+        jobs (list): Manifest jobs as returned by `load_manifest`
+        driver_pool (DriverPool): Pool whose drivers are shared by the jobs
+        
+    Returns:
+        tuple: (results, duration) where results holds one dict per job,
+            in manifest order
+    """
+    from utils.web_utils import clear_browser_state
+    
+    def run(job):
+        with driver_pool.acquire() as driver:
+            result, similarity_score, duration = compare_job(job, driver)
+            clear_browser_state(driver)
+        return {"name": job["name"], "result": result, "duration": duration, "similarity_score": similarity_score}
+    
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=driver_pool.size) as executor:
+        results = list(executor.map(run, jobs))
+    return results, time.time() - start_time
@@ -1,151 +1,86 @@
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
-from rich.table import Table
 from rich.text import Text
 from rich import box
+import os
 import time
 
-console = Console()
+_console = None
+
+def _get_console():
+    """Create the Rich console on first use so importing the demo doesn't probe the terminal."""
+    global _console
+    if _console is None:
+        _console = Console()
+    return _console
 
 result = "Success"
 duration = 3.30
 
-# 1. Classic Blue & White
-panel_title1 = Text("Baseline Capture Summary", style="bold blue")
-table1 = Table(show_header=False, box=None, pad_edge=False)
-table1.add_row("📊 [bold cyan]Result[/bold cyan]", "[green]Success[/green]")
-table1.add_row("⏱️  [bold cyan]Duration[/bold cyan]", f"[white]{duration:.2f} seconds[/white]")
-
-console.print("\n[bold]Classic Blue & White:[/bold]")
-console.print(Panel(table1, title=panel_title1, border_style="cyan", box=box.ROUNDED, expand=False))
-
-# Pause before next scheme
-time.sleep(1.5)
-console.print("\n[dim]--- Switching to Dracula (Purple & Pink) ---[/dim]\n")
-time.sleep(1)
-
-# 2. Dracula (Purple & Pink)
-panel_title2 = Text("Baseline Capture Summary", style="bold magenta")
-table2 = Table(show_header=False, box=None, pad_edge=False)
-table2.add_row("🦇 [bold magenta]Result[/bold magenta]", "[bright_green]Success[/bright_green]")
-table2.add_row("⏱️  [bold magenta]Duration[/bold magenta]", f"[white]{duration:.2f} seconds[/white]")
-
-console.print("[bold]Dracula (Purple & Pink):[/bold]")
-console.print(Panel(table2, title=panel_title2, border_style="magenta", box=box.ROUNDED, expand=False))
-
-time.sleep(1.5)
-console.print("\n[dim]--- Switching to Monochrome Gray ---[/dim]\n")
-time.sleep(1)
-
-# 3. Monochrome Gray
-panel_title3 = Text("Baseline Capture Summary", style="bold bright_black")
-table3 = Table(show_header=False, box=None, pad_edge=False)
-table3.add_row("⬜ [bold gray70]Result[/bold gray70]", "[white]Success[/white]")
-table3.add_row("⏱️  [bold gray70]Duration[/bold gray70]", f"[white]{duration:.2f} seconds[/white]")
-
-console.print("[bold]Monochrome Gray:[/bold]")
-console.print(Panel(table3, title=panel_title3, border_style="gray50", box=box.ROUNDED, expand=False))
-
-time.sleep(1.5)
-console.print("\n[dim]--- Switching to Solarized ---[/dim]\n")
-time.sleep(1)
-
-# 4. Solarized
-panel_title4 = Text("Baseline Capture Summary", style="bold bright_yellow")
-table4 = Table(show_header=False, box=None, pad_edge=False)
-table4.add_row("🌞 [bold bright_cyan]Result[/bold bright_cyan]", "[bright_green]Success[/bright_green]")
-table4.add_row("⏱️  [bold bright_cyan]Duration[/bold bright_cyan]", f"[bright_white]{duration:.2f} seconds[/bright_white]")
-
-console.print("[bold]Solarized:[/bold]")
-console.print(Panel(table4, title=panel_title4, border_style="yellow", box=box.ROUNDED, expand=False))
-
-time.sleep(1.5)
-console.print("\n[dim]--- Switching to Nord Theme (Cool Blues) ---[/dim]\n")
-time.sleep(1)
-
-# 5. Nord Theme (Cool Blues)
-panel_title5 = Text("Baseline Capture Summary", style="bold bright_cyan")
-table5 = Table(show_header=False, box=None, pad_edge=False)
-table5.add_row("❄️ [bold bright_cyan]Result[/bold bright_cyan]", "[bright_white]Success[/bright_white]")
-table5.add_row("⏱️  [bold bright_cyan]Duration[/bold bright_cyan]", f"[bright_white]{duration:.2f} seconds[/bright_white]")
-
-console.print("[bold]Nord Theme (Cool Blues):[/bold]")
-console.print(Panel(table5, title=panel_title5, border_style="bright_cyan", box=box.ROUNDED, expand=False))
-
-time.sleep(1.5)
-console.print("\n[dim]--- Switching to High Contrast ---[/dim]\n")
-time.sleep(1)
-
-# 6. High Contrast
-panel_title6 = Text("Baseline Capture Summary", style="bold white")
-table6 = Table(show_header=False, box=None, pad_edge=False)
-table6.add_row("⚡ [bold white]Result[/bold white]", "[green]Success[/green]")
-table6.add_row("⏱️  [bold white]Duration[/bold white]", f"[yellow]{duration:.2f} seconds[/yellow]")
-
-console.print("[bold]High Contrast:[/bold]")
-console.print(Panel(table6, title=panel_title6, border_style="white", box=box.ROUNDED, expand=False))
-
-time.sleep(1.5)
-console.print("\n[dim]--- Switching to Radical Rainbow ---[/dim]\n")
-time.sleep(1)
-
-# 7. Radical Rainbow
-panel_title7 = Text("Baseline Capture Summary", style="bold red")
-table7 = Table(show_header=False, box=None, pad_edge=False)
-table7.add_row("🌈 [bold red]Result[/bold red]", "[bold yellow]S[/bold yellow][bold green]u[/bold green][bold cyan]c[/bold cyan][bold blue]c[/bold blue][bold magenta]e[/bold magenta][bold red]s[/bold red][bold yellow]s[/bold yellow]")
-table7.add_row("⏱️  [bold magenta]Duration[/bold magenta]", f"[bold blue]{duration:.2f} seconds[/bold blue]")
-
-console.print("[bold]Radical Rainbow:[/bold]")
-console.print(Panel(table7, title=panel_title7, border_style="bright_yellow", box=box.HEAVY, expand=False))
-
-time.sleep(1.5)
-console.print("\n[dim]--- Switching to Vaporwave ---[/dim]\n")
-time.sleep(1)
-
-# 8. Vaporwave
-panel_title8 = Text("Baseline Capture Summary", style="bold bright_magenta")
-table8 = Table(show_header=False, box=None, pad_edge=False)
-table8.add_row("🦄 [bold bright_magenta]Result[/bold bright_magenta]", "[bold bright_cyan]Success[/bold bright_cyan]")
-table8.add_row("⏱️  [bold bright_magenta]Duration[/bold bright_magenta]", f"[bold bright_pink]{duration:.2f} seconds[/bold bright_pink]")
-
-console.print("[bold]Vaporwave:[/bold]")
-console.print(Panel(table8, title=panel_title8, border_style="bright_cyan", box=box.DOUBLE, expand=False))
-
-time.sleep(1.5)
-console.print("\n[dim]--- Switching to Hacker Green ---[/dim]\n")
-time.sleep(1)
-
-# 9. Hacker Green
-panel_title9 = Text("Baseline Capture Summary", style="bold green")
-table9 = Table(show_header=False, box=None, pad_edge=False)
-table9.add_row("💾 [bold green]Result[/bold green]", "[bold bright_green]Success[/bold bright_green]")
-table9.add_row("⏱️  [bold green]Duration[/bold green]", f"[bold bright_green]{duration:.2f} seconds[/bold bright_green]")
-
-console.print("[bold]Hacker Green:[/bold]")
-console.print(Panel(table9, title=panel_title9, border_style="green", box=box.MINIMAL_DOUBLE_HEAD, expand=False))
-
-time.sleep(1.5)
-console.print("\n[dim]--- Switching to Firestorm ---[/dim]\n")
-time.sleep(1)
-
-# 10. Firestorm
-panel_title10 = Text("Baseline Capture Summary", style="bold bright_red")
-table10 = Table(show_header=False, box=None, pad_edge=False)
-table10.add_row("🔥 [bold bright_red]Result[/bold bright_red]", "[bold yellow]Success[/bold yellow]")
-table10.add_row("⏱️  [bold bright_red]Duration[/bold bright_red]", f"[bold yellow]{duration:.2f} seconds[/bold yellow]")
-
-console.print("[bold]Firestorm:[/bold]")
-console.print(Panel(table10, title=panel_title10, border_style="bright_red", box=box.SQUARE, expand=False))
-
-time.sleep(1.5)
-console.print("\n[dim]--- Switching to Cyberpunk ---[/dim]\n")
-time.sleep(1)
-
-# 11. Cyberpunk
-panel_title11 = Text("Baseline Capture Summary", style="bold bright_magenta")
-table11 = Table(show_header=False, box=None, pad_edge=False)
-table11.add_row("🤖 [bold bright_magenta]Result[/bold bright_magenta]", "[bold bright_yellow]Success[/bold bright_yellow]")
-table11.add_row("⏱️  [bold bright_magenta]Duration[/bold bright_magenta]", f"[bold bright_cyan]{duration:.2f} seconds[/bold bright_cyan]")
-
-console.print("[bold]Cyberpunk:[/bold]")
-console.print(Panel(table11, title=panel_title11, border_style="bright_magenta", box=box.ROUNDED, expand=False)) 
\ No newline at end of file
+# Seconds to show each scheme before switching to the next; FAST=1 prints them all at once
+PAUSE = 0 if os.environ.get("FAST") == "1" else 2.5
+
+RAINBOW_SUCCESS = Text.assemble(
+    ("S", "bold yellow"), ("u", "bold green"), ("c", "bold cyan"), ("c", "bold blue"),
+    ("e", "bold magenta"), ("s", "bold red"), ("s", "bold yellow")
+)
+
+# Each scheme styles the summary panel's title, labels, values and border
+SCHEMES = [
+    {"name": "Classic Blue & White", "icon": "📊", "title_style": "bold blue", "result_label_style": "bold cyan", "duration_label_style": "bold cyan",
+     "success": Text.assemble(("Success", "green")), "duration_style": "white", "border_style": "cyan", "box": box.ROUNDED},
+    {"name": "Dracula (Purple & Pink)", "icon": "🦇", "title_style": "bold magenta", "result_label_style": "bold magenta", "duration_label_style": "bold magenta",
+     "success": Text.assemble(("Success", "bright_green")), "duration_style": "white", "border_style": "magenta", "box": box.ROUNDED},
+    {"name": "Monochrome Gray", "icon": "⬜", "title_style": "bold bright_black", "result_label_style": "bold gray70", "duration_label_style": "bold gray70",
+     "success": Text.assemble(("Success", "white")), "duration_style": "white", "border_style": "gray50", "box": box.ROUNDED},
+    {"name": "Solarized", "icon": "🌞", "title_style": "bold bright_yellow", "result_label_style": "bold bright_cyan", "duration_label_style": "bold bright_cyan",
+     "success": Text.assemble(("Success", "bright_green")), "duration_style": "bright_white", "border_style": "yellow", "box": box.ROUNDED},
+    {"name": "Nord Theme (Cool Blues)", "icon": "❄️", "title_style": "bold bright_cyan", "result_label_style": "bold bright_cyan", "duration_label_style": "bold bright_cyan",
+     "success": Text.assemble(("Success", "bright_white")), "duration_style": "bright_white", "border_style": "bright_cyan", "box": box.ROUNDED},
+    {"name": "High Contrast", "icon": "⚡", "title_style": "bold white", "result_label_style": "bold white", "duration_label_style": "bold white",
+     "success": Text.assemble(("Success", "green")), "duration_style": "yellow", "border_style": "white", "box": box.ROUNDED},
+    {"name": "Radical Rainbow", "icon": "🌈", "title_style": "bold red", "result_label_style": "bold red", "duration_label_style": "bold magenta",
+     "success": RAINBOW_SUCCESS, "duration_style": "bold blue", "border_style": "bright_yellow", "box": box.HEAVY},
+    {"name": "Vaporwave", "icon": "🦄", "title_style": "bold bright_magenta", "result_label_style": "bold bright_magenta", "duration_label_style": "bold bright_magenta",
+     "success": Text.assemble(("Success", "bold bright_cyan")), "duration_style": "bold bright_pink", "border_style": "bright_cyan", "box": box.DOUBLE},
+    {"name": "Hacker Green", "icon": "💾", "title_style": "bold green", "result_label_style": "bold green", "duration_label_style": "bold green",
+     "success": Text.assemble(("Success", "bold bright_green")), "duration_style": "bold bright_green", "border_style": "green", "box": box.MINIMAL_DOUBLE_HEAD},
+    {"name": "Firestorm", "icon": "🔥", "title_style": "bold bright_red", "result_label_style": "bold bright_red", "duration_label_style": "bold bright_red",
+     "success": Text.assemble(("Success", "bold yellow")), "duration_style": "bold yellow", "border_style": "bright_red", "box": box.SQUARE},
+    {"name": "Cyberpunk", "icon": "🤖", "title_style": "bold bright_magenta", "result_label_style": "bold bright_magenta", "duration_label_style": "bold bright_magenta",
+     "success": Text.assemble(("Success", "bold bright_yellow")), "duration_style": "bold bright_cyan", "border_style": "bright_magenta", "box": box.ROUNDED},
+]
+
+
+def render(scheme, duration, leading_newline=False):
+    """Build a scheme's label and summary panel."""
+    rows = [
+        (Text.assemble(f"{scheme['icon']} ", ("Result", scheme["result_label_style"])), scheme["success"]),
+        (Text.assemble("⏱️  ", ("Duration", scheme["duration_label_style"])), Text.assemble((f"{duration:.2f} seconds", scheme["duration_style"]))),
+    ]
+    # Two fixed rows don't need Table's column measuring; pad the cells to line them up
+    label_width = max(label.cell_len for label, _ in rows)
+    value_width = max(value.cell_len for _, value in rows)
+    lines = Text("\n").join(
+        Text.assemble(label, " " * (label_width - label.cell_len + 2), value, " " * (value_width - value.cell_len))
+        for label, value in rows
+    )
+
+    title = Text("Baseline Capture Summary", style=scheme["title_style"])
+    label = ("\n" if leading_newline else "") + f"[bold]{scheme['name']}:[/bold]"
+    return Group(label, Panel(lines, title=title, border_style=scheme["border_style"], box=scheme["box"], expand=False))
+
+
+def main():
+    """Print every colour scheme's summary panel, pausing between them."""
+    console = _get_console()
+    for index, scheme in enumerate(SCHEMES):
+        if index:
+            console.print(f"\n[dim]--- Switching to {scheme['name']} ---[/dim]\n")
+        console.print(render(scheme, duration, leading_newline=index == 0))
+        if PAUSE and index < len(SCHEMES) - 1:
+            time.sleep(PAUSE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+import re
+import sys
+import importlib
+import traceback
+from types import SimpleNamespace
+import pytest
+from utils import error_utils
+
+# argparse words a missing argument differently for plain arguments and required groups
+REQUIRED_ARG_RE = re.compile(r"arguments are required: (?P<missing>.+)|one of the arguments (?P<group>.+) is required")
+
+def missing_args(stderr):
+    """Return the arguments named in argparse's missing-argument error, or "" if there is none."""
+    match = REQUIRED_ARG_RE.search(stderr)
+    return match.group("missing") or match.group("group") if match else ""
+
+def assert_contains(text, expected):
+    """Assert that every expected substring is in text, listing any that are missing."""
+    missing = [substring for substring in expected if substring not in text]
+    assert not missing, f"missing from output: {missing}"
+
+@pytest.fixture(scope="session", autouse=True)
+def screenshot_dirs(tmp_path_factory):
+    """
+    Point the screenshot directories at a temporary folder for the session.
+    
+    tmp_path_factory is per xdist worker, so parallel workers never write
+    over each other's baselines, results or diffs.
+    """
+    from config import config
+    from scripts import capture, compare
+    root = tmp_path_factory.mktemp("screenshots")
+    dirs = {
+        "SCREENSHOT_DIR": str(root),
+        "BASELINE_DIR": str(root / "baseline"),
+        "RESULTS_DIR": str(root / "results"),
+        "DIFF_DIR": str(root / "diff"),
+    }
+    with pytest.MonkeyPatch.context() as mp:
+        # The scripts import the directories by name, so patch their copies too
+        for module in (config, capture, compare):
+            for name, path in dirs.items():
+                if hasattr(module, name):
+                    mp.setattr(module, name, path)
+        mp.setattr(config, "_dirs_ready", False)
+        yield dirs
+
+@pytest.fixture(scope="session")
+def baseline_module():
+    """Import baseline.py once per test session."""
+    return importlib.import_module("baseline")
+
+def _run_main(baseline_module, args):
+    """Call baseline.py's main() with args as the command line and return its exit code."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(sys, "argv", ["baseline.py"] + args)
+        # --no-spinner turns spinners off for the whole process; undo it afterwards
+        mp.setattr(error_utils, "_spinners_enabled", error_utils._spinners_enabled)
+        try:
+            baseline_module.main()
+        except SystemExit as e:
+            return e.code or 0
+        except Exception:
+            # An uncaught exception would have ended the process with a traceback
+            print(traceback.format_exc(), file=sys.stderr)
+            return 1
+    return 0
+
+@pytest.fixture
+def cli(baseline_module, capsys):
+    """Run baseline.py's main() in-process and capture its output like a subprocess would."""
+    def _run(args):
+        returncode = _run_main(baseline_module, args)
+        out, err = capsys.readouterr()
+        return SimpleNamespace(returncode=returncode, stdout=out, stderr=err)
+    return _run
+
+@pytest.fixture(scope="session")
+def login_baseline(baseline_module, screenshot_dirs):
+    """Capture the login page baseline once per session for the tests that compare against it."""
+    from config.config import TARGET_URL
+    _run_main(baseline_module, ['capture', '--url', TARGET_URL, '--name', 'login', '--page'])
+    baseline_path = os.path.join(screenshot_dirs["BASELINE_DIR"], "login_baseline.png")
+    if not os.path.exists(baseline_path):
+        pytest.skip("Couldn't capture the login baseline")
+    return baseline_path
@@ -0,0 +1,61 @@
+import json
+import pytest
+from tests.conftest import assert_contains
+from config.config import TARGET_URL
+
+@pytest.fixture
+def run_cli(cli):
+    return lambda args: cli(['capture'] + args)
+
+def write_manifest(tmp_path, jobs):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps(jobs))
+    return str(manifest_path)
+
+def test_batch_manifest_not_found(run_cli):
+    # Test --batch pointing at a file that doesn't exist
+    result = run_cli(['--batch', 'does-not-exist.json'])
+    assert_contains(result.stdout, ["Manifest not found", "Baseline Capture Summary", "Result", "Failed"])
+
+def test_batch_manifest_invalid_json(run_cli, tmp_path):
+    # Test --batch with a manifest that isn't valid JSON
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text("{not json")
+    result = run_cli(['--batch', str(manifest_path)])
+    assert_contains(result.stdout, ["Invalid manifest", "Failed"])
+
+def test_batch_element_job_without_selector(run_cli, tmp_path):
+    # Test an element job that has neither a selector nor a class
+    manifest_path = write_manifest(tmp_path, [{"url": TARGET_URL, "name": "login", "mode": "element"}])
+    result = run_cli(['--batch', manifest_path])
+    assert "job 1 needs a selector or class for element mode" in result.stdout
+
+def test_batch_job_without_name(run_cli, tmp_path):
+    # Test a job that is missing its name
+    manifest_path = write_manifest(tmp_path, [{"url": TARGET_URL}])
+    result = run_cli(['--batch', manifest_path])
+    assert "job 1 needs a url and a name" in result.stdout
+
+def test_batch_with_page_provided(run_cli, tmp_path):
+    # Test providing both --batch and --page (should be mutually exclusive)
+    manifest_path = write_manifest(tmp_path, [{"url": TARGET_URL, "name": "login"}])
+    result = run_cli(['--batch', manifest_path, '--page'])
+    assert result.returncode == 2  # argparse error code
+    assert "not allowed" in result.stderr or "mutually exclusive" in result.stderr
+
+def test_batch_workers_below_one(run_cli, tmp_path):
+    # Test --workers with a value that can't run any jobs
+    manifest_path = write_manifest(tmp_path, [{"url": TARGET_URL, "name": "login"}])
+    result = run_cli(['--batch', manifest_path, '--workers', '0'])
+    assert result.returncode == 2  # argparse error code
+    assert "--workers must be at least 1" in result.stderr
+
+def test_batch_duplicate_job(run_cli, tmp_path):
+    # Test two jobs with the same name and mode, which would overwrite each other's images
+    manifest_path = write_manifest(tmp_path, [
+        {"url": TARGET_URL, "name": "login"},
+        {"url": TARGET_URL, "name": "login", "mode": "element", "selector": "form"},
+        {"url": TARGET_URL, "name": "login", "mode": "page"},
+    ])
+    result = run_cli(['--batch', manifest_path])
+    assert "job 3 repeats the page job named 'login'" in result.stdout
@@ -0,0 +1,52 @@
+import json
+import pytest
+from tests.conftest import assert_contains
+from unittest.mock import MagicMock
+from config.config import TARGET_URL
+
+@pytest.fixture
+def run_cli(cli):
+    return lambda args: cli(['compare'] + args)
+
+def write_manifest(tmp_path, jobs):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps(jobs))
+    return str(manifest_path)
+
+def test_batch_manifest_not_found(run_cli):
+    # Test --batch pointing at a file that doesn't exist
+    result = run_cli(['--batch', 'does-not-exist.json'])
+    assert_contains(result.stdout, ["Manifest not found", "Baseline Comparison Summary", "Result", "Failed"])
+
+def test_batch_element_job_without_selector(run_cli, tmp_path):
+    # Test an element job that has neither a selector nor a class
+    manifest_path = write_manifest(tmp_path, [{"url": TARGET_URL, "name": "login", "mode": "element"}])
+    result = run_cli(['--batch', manifest_path])
+    assert "job 1 needs a selector or class for element mode" in result.stdout
+
+def test_batch_with_element_provided(run_cli, tmp_path):
+    # Test providing both --batch and --element (should be mutually exclusive)
+    manifest_path = write_manifest(tmp_path, [{"url": TARGET_URL, "name": "login"}])
+    result = run_cli(['--batch', manifest_path, '--element'])
+    assert result.returncode == 2  # argparse error code
+    assert "not allowed" in result.stderr or "mutually exclusive" in result.stderr
+
+def test_batch_workers_below_one(run_cli, tmp_path):
+    # Test --workers with a value that can't run any jobs
+    manifest_path = write_manifest(tmp_path, [{"url": TARGET_URL, "name": "login"}])
+    result = run_cli(['--batch', manifest_path, '--workers', '0'])
+    assert result.returncode == 2  # argparse error code
+    assert "--workers must be at least 1" in result.stderr
+
+def test_compare_batch_missing_baselines_skip_browser():
+    # Test that jobs without a baseline fail without touching the browser
+    from scripts.compare import compare_batch
+    driver = MagicMock()
+    jobs = [
+        {"url": TARGET_URL, "name": "no-such-baseline", "mode": "page"},
+        {"url": TARGET_URL, "name": "no-such-element", "mode": "element", "selector": "button"}
+    ]
+    results, duration = compare_batch(jobs, driver)
+    assert [r["name"] for r in results] == ["no-such-baseline", "no-such-element"]
+    assert all(r["result"] == "Failed" and r["similarity_score"] is None for r in results)
+    driver.get.assert_not_called()
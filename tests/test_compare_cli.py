@@ -1,92 +1,123 @@
-import subprocess
-import sys
 import os
+import cv2
+import numpy as np
 import pytest
+from unittest.mock import MagicMock
+from tests.conftest import assert_contains, missing_args
 from config.config import TARGET_URL
+from utils import web_utils
 
-SCRIPT_PATH = os.path.join(os.path.dirname(__file__), '..', 'baseline.py')
+@pytest.fixture
+def run_cli(cli):
+    return lambda args: cli(['compare'] + args)
 
-def run_cli(args):
-    result = subprocess.run(
-        [sys.executable, SCRIPT_PATH] + ['compare'] + args,
-        capture_output=True,
-        text=True
-    )
-    return result
+@pytest.fixture
+def fake_browser(monkeypatch, screenshot_dirs):
+    """Serve a screenshot from a fake browser and return it, its baseline and its diff path."""
+    page = np.full((120, 200, 3), 255, dtype=np.uint8)
+    os.makedirs(screenshot_dirs["BASELINE_DIR"], exist_ok=True)
+    os.makedirs(screenshot_dirs["DIFF_DIR"], exist_ok=True)
+    cv2.imwrite(os.path.join(screenshot_dirs["BASELINE_DIR"], "fake_baseline.png"), page)
+    screenshot = {"png": cv2.imencode(".png", page)[1].tobytes()}
+    monkeypatch.setattr(web_utils, "get_driver", lambda **kwargs: MagicMock())
+    monkeypatch.setattr(web_utils, "release_driver", lambda driver: None)
+    monkeypatch.setattr(web_utils, "wait_for_page_load_complete", lambda driver: True)
+    monkeypatch.setattr(web_utils, "get_screenshot_png", lambda driver: screenshot["png"])
+    return page, screenshot, os.path.join(screenshot_dirs["DIFF_DIR"], "fake_diff.png")
 
-def test_baseline_success():
-    # Ensure the baseline image exists before running this test
-    from config.config import BASELINE_DIR
-    baseline_path = os.path.join(BASELINE_DIR, "login_baseline.png")
-    if not os.path.exists(baseline_path):
-        pytest.skip("Baseline image does not exist.")
+def test_failing_compare_writes_diff(run_cli, fake_browser):
+    # A changed page gets a diff image with the change boxed
+    page, screenshot, diff_path = fake_browser
+    changed = page.copy()
+    cv2.rectangle(changed, (120, 30), (180, 100), (0, 0, 0), -1)
+    screenshot["png"] = cv2.imencode(".png", changed)[1].tobytes()
+    result = run_cli(['--url', TARGET_URL, '--name', 'fake'])
+    assert "Failed" in result.stdout
+    assert os.path.exists(diff_path)
+
+def test_passing_compare_removes_stale_diff(run_cli, fake_browser):
+    # The diff left by an earlier failure is removed once the page matches again
+    _, _, diff_path = fake_browser
+    with open(diff_path, "wb") as f:
+        f.write(b"stale")
+    result = run_cli(['--url', TARGET_URL, '--name', 'fake'])
+    assert "Success" in result.stdout
+    assert not os.path.exists(diff_path)
+
+@pytest.mark.slow
+def test_baseline_success(run_cli, login_baseline):
     result = run_cli(['--url', TARGET_URL, '--name', 'login'])
     output = result.stdout
 
     # Assert key steps in the process
-    assert "Visited URL" in output
-    assert "Screenshot captured" in output
-    assert "Screenshots compared" in output
-    assert "Results compiled" in output
+    assert_contains(output, ["Visited URL", "Screenshot captured", "Screenshots compared", "Results compiled"])
 
     # Assert summary and result
-    assert "Baseline Comparison Summary" in output
-    assert "Result" in output and "Success" in output
-    assert "Duration" in output
-    assert "Similarity Score" in output and "100.00%" in output
+    assert_contains(output, ["Baseline Comparison Summary", "Result", "Success", "Duration", "Similarity Score", "100.00%"])
 
-def test_baseline_with_page_flag():
+@pytest.mark.slow
+def test_baseline_with_page_flag(run_cli, login_baseline):
     # Test explicit --page flag (should be default anyway)
-    from config.config import BASELINE_DIR
-    baseline_path = os.path.join(BASELINE_DIR, "login_baseline.png")
-    if not os.path.exists(baseline_path):
-        pytest.skip("Baseline image does not exist.")
     result = run_cli(['--url', TARGET_URL, '--name', 'login', '--page'])
     output = result.stdout
     assert "Baseline Comparison Summary" in output
 
-def test_baseline_image_not_found():
+def test_baseline_image_not_found(run_cli):
     result = run_cli(['--url', TARGET_URL, '--name', 'nonexistent'])
-    assert "Image not found" in result.stdout
-    assert "Result" in result.stdout and "Failed" in result.stdout 
-    assert "Duration" in result.stdout and "0.00 seconds" in result.stdout 
+    assert_contains(result.stdout, ["Image not found", "Result", "Failed", "Duration", "0.00 seconds"])
 
-def test_element_missing_selector_and_class():
+def test_element_missing_selector_and_class(run_cli):
     # Test --element without --selector or --class
     result = run_cli(['--url', TARGET_URL, '--name', 'login', '--element'])
     # Should show error message about requiring --class or --selector
     assert "You must provide either --class or --selector for --element" in result.stdout
 
-def test_element_with_both_selector_and_class():
-    # Test --element with both --selector and --class (should be mutually exclusive)
-    result = run_cli(['--url', TARGET_URL, '--name', 'login', '--element', '--selector', 'img', '--class', 'some-class'])
-    assert result.returncode == 2  # argparse error code
-    assert "not allowed" in result.stderr or "mutually exclusive" in result.stderr
-
-def test_missing_url_argument():
-    # Test missing --url argument entirely
-    result = run_cli(['--name', 'login'])
-    assert result.returncode == 2  # argparse error code
-    assert "required" in result.stderr and "--url" in result.stderr
-
-def test_missing_name_argument():
-    # Test missing --name argument entirely
-    result = run_cli(['--url', TARGET_URL])
+@pytest.mark.parametrize("args,expected", [
+    (['--name', 'login'], '--url'),
+    (['--url', TARGET_URL], '--name')
+], ids=["url", "name"])
+def test_missing_required_argument(run_cli, args, expected):
+    # Test leaving out an argument argparse requires
+    result = run_cli(args)
     assert result.returncode == 2  # argparse error code
-    assert "required" in result.stderr and "--name" in result.stderr
+    assert expected in missing_args(result.stderr)
 
-def test_both_page_and_element_provided():
-    # Test providing both --page and --element (should be mutually exclusive)
-    result = run_cli(['--url', TARGET_URL, '--name', 'login', '--page', '--element', '--selector', 'img'])
+@pytest.mark.parametrize("args", [
+    ['--url', TARGET_URL, '--name', 'login', '--page', '--element', '--selector', 'img'],
+    ['--url', TARGET_URL, '--name', 'login', '--element', '--selector', 'img', '--class', 'some-class']
+], ids=["page-and-element", "selector-and-class"])
+def test_mutually_exclusive_arguments(run_cli, args):
+    # Test providing two arguments that can't be used together
+    result = run_cli(args)
     assert result.returncode == 2  # argparse error code
     assert "not allowed" in result.stderr or "mutually exclusive" in result.stderr
 
-def test_help_message():
+def test_help_message(run_cli):
     # Test that help works for compare command
     result = run_cli(['--help'])
     assert result.returncode == 0
-    assert "Compare current screenshots against baseline images" in result.stdout
-    assert "--url" in result.stdout
-    assert "--name" in result.stdout
-    assert "--page" in result.stdout
-    assert "--element" in result.stdout
+    assert_contains(result.stdout, ["Compare current screenshots against baseline images", "--url", "--name", "--page", "--element"])
+
+def test_element_compare_output_names(run_cli, fake_browser, screenshot_dirs, monkeypatch):
+    # Element results are named apart from the page results of the same name
+    page, screenshot, diff_path = fake_browser
+    changed = page.copy()
+    cv2.rectangle(changed, (120, 30), (180, 100), (0, 0, 0), -1)
+    cv2.imwrite(os.path.join(screenshot_dirs["BASELINE_DIR"], "fake_element.png"), page)
+    element = MagicMock(screenshot_as_png=cv2.imencode(".png", changed)[1].tobytes())
+    driver = MagicMock()
+    driver.find_element.return_value = element
+    monkeypatch.setattr(web_utils, "get_driver", lambda **kwargs: driver)
+    monkeypatch.setattr(web_utils, "scroll_to_element", lambda driver, element: True)
+    monkeypatch.setattr(web_utils, "wait_for_element_visible", lambda driver, element: element)
+    result = run_cli(['--url', TARGET_URL, '--name', 'fake', '--element', '--selector', 'form'])
+    assert "Failed" in result.stdout
+    assert os.path.exists(os.path.join(screenshot_dirs["DIFF_DIR"], "fake_element_diff.png"))
+    assert not os.path.exists(diff_path)
+
+def test_decode_pool_created_on_first_compare(run_cli, fake_browser, monkeypatch):
+    # Importing the module doesn't start a pool; the first comparison does
+    from scripts import compare
+    monkeypatch.setattr(compare, "_decode_pool", None)
+    run_cli(['--url', TARGET_URL, '--name', 'fake'])
+    assert compare._decode_pool is not None
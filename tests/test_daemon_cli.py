@@ -0,0 +1,113 @@
+import os
+import sys
+import subprocess
+from unittest.mock import MagicMock
+import pytest
+from tests.conftest import assert_contains, missing_args
+from utils import daemon_utils
+
+@pytest.fixture
+def run_cli(cli):
+    return lambda args: cli(['daemon'] + args)
+
+def test_missing_action_argument(run_cli):
+    # Test missing daemon action entirely
+    result = run_cli([])
+    assert result.returncode == 2  # argparse error code
+    assert "action" in missing_args(result.stderr)
+
+def test_invalid_action_argument(run_cli):
+    # Test an action that isn't start, stop or status
+    result = run_cli(['restart'])
+    assert result.returncode == 2  # argparse error code
+    assert "invalid choice" in result.stderr
+
+def test_help_message(run_cli):
+    # Test that help works for daemon command
+    result = run_cli(['--help'])
+    assert result.returncode == 0
+    assert_contains(result.stdout, ["long-lived browser", "start", "stop", "status"])
+
+@pytest.fixture
+def daemon_files(tmp_path, monkeypatch):
+    """Point the daemon's PID and endpoint files at a temp dir."""
+    pid_file = tmp_path / "daemon.pid"
+    endpoint_file = tmp_path / "endpoint"
+    endpoint_file.write_text("ws://127.0.0.1:9222/devtools/browser/x")
+    monkeypatch.setattr(daemon_utils, "DAEMON_DIR", str(tmp_path))
+    monkeypatch.setattr(daemon_utils, "DAEMON_PID_FILE", str(pid_file))
+    monkeypatch.setattr(daemon_utils, "DAEMON_ENDPOINT_FILE", str(endpoint_file))
+    return pid_file, endpoint_file
+
+def test_stop_ignores_corrupt_pid_file(daemon_files, monkeypatch):
+    # A corrupt PID file is cleaned up instead of raising ValueError
+    pid_file, endpoint_file = daemon_files
+    pid_file.write_text("not a pid")
+    monkeypatch.setattr(os, "kill", lambda *args: pytest.fail("nothing should be signalled"))
+    assert daemon_utils.stop_daemon() is False
+    assert not pid_file.exists() and not endpoint_file.exists()
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses ps to inspect the process")
+def test_stop_leaves_unrelated_process_running(daemon_files, monkeypatch):
+    # A PID reused by another process (here the test runner) is never signalled
+    pid_file, endpoint_file = daemon_files
+    pid_file.write_text(str(os.getpid()))
+    monkeypatch.setattr(os, "kill", lambda *args: pytest.fail("nothing should be signalled"))
+    assert daemon_utils.stop_daemon() is False
+    assert not pid_file.exists()
+
+@pytest.fixture
+def fake_daemon(daemon_files, tmp_path):
+    """A process launched with the daemon's profile, recorded in the PID file."""
+    pid_file, _ = daemon_files
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)", f"--user-data-dir={tmp_path / 'profile'}"])
+    pid_file.write_text(str(process.pid))
+    yield process
+    process.kill()
+    process.wait()
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses ps to inspect the process")
+def test_stop_terminates_daemon_process(fake_daemon):
+    # A process launched with the daemon's profile is recognised and stopped
+    assert daemon_utils.stop_daemon() is True
+    assert fake_daemon.wait(timeout=5) != 0
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses ps to inspect the process")
+def test_address_requires_daemon_process(daemon_files, monkeypatch):
+    # A browser answering on the port isn't the daemon unless the PID file names it
+    pid_file, _ = daemon_files
+    monkeypatch.setattr(daemon_utils, "_fetch_version_info", lambda address: {})
+    assert daemon_utils.get_daemon_address() is None
+    pid_file.write_text(str(os.getpid()))
+    assert daemon_utils.get_daemon_address() is None
+
+@pytest.mark.skipif(sys.platform == "win32", reason="uses ps to inspect the process")
+def test_address_of_running_daemon(fake_daemon, monkeypatch):
+    # The recorded daemon's address is returned while it answers
+    monkeypatch.setattr(daemon_utils, "_fetch_version_info", lambda address: {})
+    assert daemon_utils.get_daemon_address() == "127.0.0.1:9222"
+
+def test_start_refuses_busy_port(daemon_files, monkeypatch):
+    # Another browser already debugging on the port is never taken over
+    pid_file, endpoint_file = daemon_files
+    endpoint_file.unlink()
+    monkeypatch.setattr(daemon_utils, "find_chrome_binary", lambda: "chrome")
+    monkeypatch.setattr(daemon_utils, "_fetch_version_info", lambda address: {"webSocketDebuggerUrl": "ws://other"})
+    monkeypatch.setattr(subprocess, "Popen", lambda *args, **kwargs: pytest.fail("Chrome shouldn't be launched"))
+    with pytest.raises(RuntimeError, match="already listening"):
+        daemon_utils.start_daemon()
+    assert not pid_file.exists() and not endpoint_file.exists()
+
+def test_start_fails_when_chrome_exits(daemon_files, monkeypatch):
+    # A Chrome that exits (e.g. it couldn't bind the port) isn't recorded, even if the port answers
+    pid_file, endpoint_file = daemon_files
+    endpoint_file.unlink()
+    answers = iter([None, {"webSocketDebuggerUrl": "ws://other"}])
+    process = MagicMock(pid=4321)
+    process.poll.return_value = 1
+    monkeypatch.setattr(daemon_utils, "find_chrome_binary", lambda: "chrome")
+    monkeypatch.setattr(daemon_utils, "_fetch_version_info", lambda address: next(answers))
+    monkeypatch.setattr(subprocess, "Popen", lambda *args, **kwargs: process)
+    with pytest.raises(RuntimeError, match="exited"):
+        daemon_utils.start_daemon()
+    assert not pid_file.exists() and not endpoint_file.exists()
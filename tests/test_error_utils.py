@@ -16,48 +16,71 @@ from rich.table import Table
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils import error_utils
 from utils.error_utils import (
     handle_cli_error,
     handle_multiple_cli_errors,
     format_function_error,
-    display_success_summary
+    display_success_summary,
+    display_batch_summary,
+    console_status,
+    disable_spinners
 )
 
 
+
+@pytest.fixture(autouse=True)
+def console_output(monkeypatch):
+    """
+    Send error_utils output to a plain in-memory console.
+    
+    Returns a function that returns the output so far and clears it,
+    like capsys.readouterr() without ANSI codes or terminal detection.
+    """
+    buffer = StringIO()
+    monkeypatch.setattr(error_utils, "console", Console(file=buffer, width=120, force_terminal=False, no_color=True))
+    
+    def read():
+        output = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return output
+    return read
+
 class TestHandleCliError:
     """Test the handle_cli_error function."""
     
-    def test_handle_cli_error_capture_operation(self, capsys):
+    def test_handle_cli_error_capture_operation(self, console_output):
         """Test handle_cli_error with capture operation type."""
         with pytest.raises(SystemExit) as exc_info:
             handle_cli_error("Test error message", operation_type="capture")
         
         assert exc_info.value.code == 1
-        captured = capsys.readouterr()
+        output = console_output()
         
         # Check that error message is displayed
-        assert "Test error message" in captured.out
-        assert "Baseline Capture Summary" in captured.out
-        assert "Result" in captured.out
-        assert "Failed" in captured.out
-        assert "Duration" in captured.out
-        assert "0.00 seconds" in captured.out
-    
-    def test_handle_cli_error_compare_operation(self, capsys):
+        assert "Test error message" in output
+        assert "Baseline Capture Summary" in output
+        assert "Result" in output
+        assert "Failed" in output
+        assert "Duration" in output
+        assert "0.00 seconds" in output
+    
+    def test_handle_cli_error_compare_operation(self, console_output):
         """Test handle_cli_error with compare operation type."""
         with pytest.raises(SystemExit) as exc_info:
             handle_cli_error("Test error message", operation_type="compare")
         
         assert exc_info.value.code == 1
-        captured = capsys.readouterr()
+        output = console_output()
         
         # Check that correct panel title is used
-        assert "Test error message" in captured.out
-        assert "Baseline Comparison Summary" in captured.out
-        assert "Result" in captured.out
-        assert "Failed" in captured.out
+        assert "Test error message" in output
+        assert "Baseline Comparison Summary" in output
+        assert "Result" in output
+        assert "Failed" in output
     
-    def test_handle_cli_error_custom_parameters(self, capsys):
+    def test_handle_cli_error_custom_parameters(self, console_output):
         """Test handle_cli_error with custom parameters."""
         with pytest.raises(SystemExit) as exc_info:
             handle_cli_error(
@@ -69,40 +92,40 @@ class TestHandleCliError:
             )
         
         assert exc_info.value.code == 2
-        captured = capsys.readouterr()
+        output = console_output()
         
-        assert "Custom error" in captured.out
-        assert "Error" in captured.out
-        assert "2.50 seconds" in captured.out
+        assert "Custom error" in output
+        assert "Error" in output
+        assert "2.50 seconds" in output
     
-    def test_handle_cli_error_default_operation_type(self, capsys):
+    def test_handle_cli_error_default_operation_type(self, console_output):
         """Test handle_cli_error with default operation type."""
         with pytest.raises(SystemExit):
             handle_cli_error("Default test")
         
-        captured = capsys.readouterr()
+        output = console_output()
         # Should default to capture operation
-        assert "Baseline Capture Summary" in captured.out
+        assert "Baseline Capture Summary" in output
     
-    def test_handle_cli_error_case_insensitive_operation(self, capsys):
+    def test_handle_cli_error_case_insensitive_operation(self, console_output):
         """Test handle_cli_error with case variations in operation type."""
         with pytest.raises(SystemExit):
             handle_cli_error("Test", operation_type="COMPARE")
         
-        captured = capsys.readouterr()
-        assert "Baseline Comparison Summary" in captured.out
+        output = console_output()
+        assert "Baseline Comparison Summary" in output
         
         with pytest.raises(SystemExit):
             handle_cli_error("Test", operation_type="Compare")
         
-        captured = capsys.readouterr()
-        assert "Baseline Comparison Summary" in captured.out
+        output = console_output()
+        assert "Baseline Comparison Summary" in output
 
 
 class TestHandleMultipleCliErrors:
     """Test the handle_multiple_cli_errors function."""
     
-    def test_handle_multiple_cli_errors_basic(self, capsys):
+    def test_handle_multiple_cli_errors_basic(self, console_output):
         """Test handle_multiple_cli_errors with multiple messages."""
         messages = ["First error", "Second error", "Third error"]
         
@@ -110,37 +133,37 @@ class TestHandleMultipleCliErrors:
             handle_multiple_cli_errors(messages, operation_type="compare")
         
         assert exc_info.value.code == 1
-        captured = capsys.readouterr()
+        output = console_output()
         
         # Check all error messages are displayed
         for message in messages:
-            assert message in captured.out
+            assert message in output
         
-        assert "Baseline Comparison Summary" in captured.out
-        assert "Failed" in captured.out
+        assert "Baseline Comparison Summary" in output
+        assert "Failed" in output
     
-    def test_handle_multiple_cli_errors_single_message(self, capsys):
+    def test_handle_multiple_cli_errors_single_message(self, console_output):
         """Test handle_multiple_cli_errors with single message in list."""
         messages = ["Single error message"]
         
         with pytest.raises(SystemExit):
             handle_multiple_cli_errors(messages, operation_type="capture")
         
-        captured = capsys.readouterr()
-        assert "Single error message" in captured.out
-        assert "Baseline Capture Summary" in captured.out
+        output = console_output()
+        assert "Single error message" in output
+        assert "Baseline Capture Summary" in output
     
-    def test_handle_multiple_cli_errors_empty_list(self, capsys):
+    def test_handle_multiple_cli_errors_empty_list(self, console_output):
         """Test handle_multiple_cli_errors with empty message list."""
         with pytest.raises(SystemExit):
             handle_multiple_cli_errors([], operation_type="capture")
         
-        captured = capsys.readouterr()
+        output = console_output()
         # Should still show summary table even with no error messages
-        assert "Baseline Capture Summary" in captured.out
-        assert "Failed" in captured.out
+        assert "Baseline Capture Summary" in output
+        assert "Failed" in output
     
-    def test_handle_multiple_cli_errors_custom_parameters(self, capsys):
+    def test_handle_multiple_cli_errors_custom_parameters(self, console_output):
         """Test handle_multiple_cli_errors with custom parameters."""
         messages = ["Error 1", "Error 2"]
         
@@ -154,18 +177,18 @@ class TestHandleMultipleCliErrors:
             )
         
         assert exc_info.value.code == 3
-        captured = capsys.readouterr()
+        output = console_output()
         
-        assert "Error 1" in captured.out
-        assert "Error 2" in captured.out
-        assert "Cancelled" in captured.out
-        assert "1.25 seconds" in captured.out
+        assert "Error 1" in output
+        assert "Error 2" in output
+        assert "Cancelled" in output
+        assert "1.25 seconds" in output
 
 
 class TestFormatFunctionError:
     """Test the format_function_error function."""
     
-    def test_format_function_error_basic(self, capsys):
+    def test_format_function_error_basic(self, console_output):
         """Test format_function_error with basic parameters."""
         result, output, duration = format_function_error("Function error message")
         
@@ -173,10 +196,10 @@ class TestFormatFunctionError:
         assert output is None
         assert duration == 0.0
         
-        captured = capsys.readouterr()
-        assert "Function error message" in captured.out
+        output = console_output()
+        assert "Function error message" in output
     
-    def test_format_function_error_custom_parameters(self, capsys):
+    def test_format_function_error_custom_parameters(self, console_output):
         """Test format_function_error with custom parameters."""
         result, output, duration = format_function_error(
             "Custom function error",
@@ -188,8 +211,8 @@ class TestFormatFunctionError:
         assert output is None
         assert duration == 3.75
         
-        captured = capsys.readouterr()
-        assert "Custom function error" in captured.out
+        output = console_output()
+        assert "Custom function error" in output
     
     def test_format_function_error_no_exit(self):
         """Test that format_function_error doesn't call sys.exit."""
@@ -203,152 +226,237 @@ class TestFormatFunctionError:
 class TestDisplaySuccessSummary:
     """Test the display_success_summary function."""
     
-    def test_display_success_summary_capture_without_score(self, capsys):
+    def test_display_success_summary_capture_without_score(self, console_output):
         """Test display_success_summary for capture operation without similarity score."""
         display_success_summary("Success", 2.5, operation_type="capture")
         
-        captured = capsys.readouterr()
-        assert "Baseline Capture Summary" in captured.out
-        assert "Success" in captured.out
-        assert "2.50 seconds" in captured.out
+        output = console_output()
+        assert "Baseline Capture Summary" in output
+        assert "Success" in output
+        assert "2.50 seconds" in output
         # Should not contain similarity score
-        assert "Similarity Score" not in captured.out
+        assert "Similarity Score" not in output
     
-    def test_display_success_summary_compare_with_score(self, capsys):
+    def test_display_success_summary_compare_with_score(self, console_output):
         """Test display_success_summary for compare operation with similarity score."""
         display_success_summary("Success", 1.75, similarity_score=0.95, operation_type="compare")
         
-        captured = capsys.readouterr()
-        assert "Baseline Comparison Summary" in captured.out
-        assert "Success" in captured.out
-        assert "1.75 seconds" in captured.out
-        assert "Similarity Score" in captured.out
-        assert "95.00%" in captured.out
+        output = console_output()
+        assert "Baseline Comparison Summary" in output
+        assert "Success" in output
+        assert "1.75 seconds" in output
+        assert "Similarity Score" in output
+        assert "95.00%" in output
     
-    def test_display_success_summary_failed_result(self, capsys):
+    def test_display_success_summary_failed_result(self, console_output):
         """Test display_success_summary with failed result."""
         display_success_summary("Failed", 0.5, similarity_score=0.75, operation_type="compare")
         
-        captured = capsys.readouterr()
-        assert "Failed" in captured.out
-        assert "75.00%" in captured.out
+        output = console_output()
+        assert "Failed" in output
+        assert "75.00%" in output
     
-    def test_display_success_summary_default_operation_type(self, capsys):
+    def test_display_success_summary_default_operation_type(self, console_output):
         """Test display_success_summary with default operation type."""
         display_success_summary("Success", 1.0)
         
-        captured = capsys.readouterr()
+        output = console_output()
         # Should default to capture
-        assert "Baseline Capture Summary" in captured.out
+        assert "Baseline Capture Summary" in output
     
-    def test_display_success_summary_zero_similarity_score(self, capsys):
+    def test_display_success_summary_zero_similarity_score(self, console_output):
         """Test display_success_summary with zero similarity score."""
         display_success_summary("Failed", 1.0, similarity_score=0.0, operation_type="compare")
         
-        captured = capsys.readouterr()
-        assert "0.00%" in captured.out
+        output = console_output()
+        assert "0.00%" in output
     
-    def test_display_success_summary_high_precision_score(self, capsys):
+    def test_display_success_summary_high_precision_score(self, console_output):
         """Test display_success_summary with high precision similarity score."""
         display_success_summary("Success", 1.0, similarity_score=0.987654, operation_type="compare")
         
-        captured = capsys.readouterr()
-        assert "98.77%" in captured.out  # Should round to 2 decimal places
+        output = console_output()
+        assert "98.77%" in output  # Should round to 2 decimal places
+
+
+class TestDisplayBatchSummary:
+    """Test the display_batch_summary function."""
+    
+    def test_display_batch_summary_all_success(self, console_output):
+        """Test display_batch_summary when every job succeeds."""
+        results = [
+            {"name": "homepage", "result": "Success", "duration": 1.2},
+            {"name": "button", "result": "Success", "duration": 0.8},
+        ]
+        overall = display_batch_summary(results, 2.0, operation_type="capture")
+        
+        assert overall == "Success"
+        output = console_output()
+        assert "Baseline Capture Summary" in output
+        assert "homepage" in output
+        assert "button" in output
+        assert "1.20 seconds" in output
+        assert "2.00 seconds" in output
+        assert "Similarity Score" not in output
+    
+    def test_display_batch_summary_with_failure(self, console_output):
+        """Test display_batch_summary when one job fails."""
+        results = [
+            {"name": "homepage", "result": "Success", "duration": 1.0},
+            {"name": "button", "result": "Error", "duration": 0.5},
+        ]
+        overall = display_batch_summary(results, 1.5, operation_type="capture")
+        
+        assert overall == "Failed"
+        output = console_output()
+        assert "Error" in output
+        assert "Failed" in output
+    
+    def test_display_batch_summary_compare_with_scores(self, console_output):
+        """Test display_batch_summary for comparisons with similarity scores."""
+        results = [
+            {"name": "homepage", "result": "Success", "duration": 1.0, "similarity_score": 0.99},
+            {"name": "button", "result": "Failed", "duration": 1.0, "similarity_score": None},
+        ]
+        display_batch_summary(results, 2.0, operation_type="compare")
+        
+        output = console_output()
+        assert "Baseline Comparison Summary" in output
+        assert "Similarity Score" in output
+        assert "99.00%" in output
+    
+    def test_display_batch_summary_empty_results(self, console_output):
+        """Test display_batch_summary with no results."""
+        overall = display_batch_summary([], 0.0)
+        
+        assert overall == "Failed"
+        output = console_output()
+        assert "Baseline Capture Summary" in output
 
 
 class TestEdgeCases:
     """Test edge cases and error conditions."""
     
-    def test_empty_error_message(self, capsys):
+    def test_empty_error_message(self, console_output):
         """Test behavior with empty error message."""
         with pytest.raises(SystemExit):
             handle_cli_error("", operation_type="capture")
         
-        captured = capsys.readouterr()
+        output = console_output()
         # Should still show summary even with empty message
-        assert "Baseline Capture Summary" in captured.out
+        assert "Baseline Capture Summary" in output
     
-    def test_very_long_error_message(self, capsys):
+    def test_very_long_error_message(self, console_output):
         """Test behavior with very long error message."""
         long_message = "This is a very long error message " * 10
         
         with pytest.raises(SystemExit):
             handle_cli_error(long_message, operation_type="capture")
         
-        captured = capsys.readouterr()
+        output = console_output()
         # Check for parts of the message since Rich may wrap long text
-        assert "This is a very long error message" in captured.out
-        assert "Baseline Capture Summary" in captured.out
+        assert "This is a very long error message" in output
+        assert "Baseline Capture Summary" in output
     
-    def test_unknown_operation_type(self, capsys):
+    def test_unknown_operation_type(self, console_output):
         """Test behavior with unknown operation type."""
         with pytest.raises(SystemExit):
             handle_cli_error("Test", operation_type="unknown")
         
-        captured = capsys.readouterr()
+        output = console_output()
         # Should default to capture summary for unknown operation types
-        assert "Baseline Capture Summary" in captured.out
+        assert "Baseline Capture Summary" in output
     
-    def test_negative_duration(self, capsys):
+    def test_negative_duration(self, console_output):
         """Test behavior with negative duration."""
         display_success_summary("Success", -1.5, operation_type="capture")
         
-        captured = capsys.readouterr()
-        assert "-1.50 seconds" in captured.out
+        output = console_output()
+        assert "-1.50 seconds" in output
     
-    def test_very_large_duration(self, capsys):
+    def test_very_large_duration(self, console_output):
         """Test behavior with very large duration."""
         display_success_summary("Success", 9999.99, operation_type="capture")
         
-        captured = capsys.readouterr()
-        assert "9999.99 seconds" in captured.out
+        output = console_output()
+        assert "9999.99 seconds" in output
 
 
 class TestOutputFormatting:
     """Test output formatting consistency."""
     
-    def test_duration_formatting_precision(self, capsys):
+    @pytest.mark.parametrize("duration,expected", [
+        (0, "0.00 seconds"),
+        (1, "1.00 seconds"),
+        (1.5, "1.50 seconds"),
+        (1.234, "1.23 seconds"),
+        (1.999, "2.00 seconds"),  # Should round up
+    ])
+    def test_duration_formatting_precision(self, console_output, duration, expected):
         """Test that duration is always formatted to 2 decimal places."""
-        test_cases = [
-            (0, "0.00 seconds"),
-            (1, "1.00 seconds"),
-            (1.5, "1.50 seconds"),
-            (1.234, "1.23 seconds"),
-            (1.999, "2.00 seconds"),  # Should round up
-        ]
-        
-        for duration, expected in test_cases:
-            display_success_summary("Success", duration, operation_type="capture")
-            captured = capsys.readouterr()
-            assert expected in captured.out
+        display_success_summary("Success", duration, operation_type="capture")
+        assert expected in console_output()
     
-    def test_similarity_score_formatting(self, capsys):
+    @pytest.mark.parametrize("score,expected", [
+        (0, "0.00%"),
+        (0.5, "50.00%"),
+        (0.999, "99.90%"),
+        (1.0, "100.00%"),
+        (0.12345, "12.35%"),  # Should round to 2 decimal places
+    ])
+    def test_similarity_score_formatting(self, console_output, score, expected):
         """Test that similarity score is formatted correctly."""
-        test_cases = [
-            (0, "0.00%"),
-            (0.5, "50.00%"),
-            (0.999, "99.90%"),
-            (1.0, "100.00%"),
-            (0.12345, "12.35%"),  # Should round to 2 decimal places
-        ]
-        
-        for score, expected in test_cases:
-            display_success_summary("Success", 1.0, similarity_score=score, operation_type="compare")
-            captured = capsys.readouterr()
-            assert expected in captured.out
+        display_success_summary("Success", 1.0, similarity_score=score, operation_type="compare")
+        assert expected in console_output()
     
-    def test_consistent_table_structure(self, capsys):
+    def test_consistent_table_structure(self, console_output):
         """Test that all functions produce consistent table structure."""
         # Test that all summary outputs contain the same basic elements
         display_success_summary("Success", 1.0, operation_type="capture")
-        captured = capsys.readouterr()
+        output = console_output()
         
         # Should contain these standard table elements
-        assert "Result" in captured.out
-        assert "Duration" in captured.out
-        assert "Success" in captured.out
-        assert "1.00 seconds" in captured.out
+        assert "Result" in output
+        assert "Duration" in output
+        assert "Success" in output
+        assert "1.00 seconds" in output
+
+
+class TestConsoleStatus:
+    """Test the console_status function."""
+    
+    @patch('utils.error_utils.console')
+    def test_console_status_spinner_on_terminal(self, mock_console):
+        """Test that a spinner is shown when writing to a terminal."""
+        mock_console.is_terminal = True
+        
+        status = console_status("Working")
+        
+        mock_console.status.assert_called_once_with("Working", spinner="dots", spinner_style="white")
+        assert status is mock_console.status.return_value
+    
+    @patch('utils.error_utils._spinners_enabled', True)
+    @patch('utils.error_utils.console')
+    def test_console_status_no_spinner_when_disabled(self, mock_console):
+        """Test that disable_spinners turns spinners off on a terminal too."""
+        mock_console.is_terminal = True
+        
+        disable_spinners()
+        with console_status("Working"):
+            pass
+        
+        mock_console.status.assert_not_called()
+    
+    @patch('utils.error_utils.console')
+    def test_console_status_no_spinner_without_terminal(self, mock_console):
+        """Test that no spinner is started when output is redirected."""
+        mock_console.is_terminal = False
+        
+        with console_status("Working"):
+            pass
+        
+        mock_console.status.assert_not_called()
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"]) 
\ No newline at end of file
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,449 @@
+"""
+Test suite for image processing utilities.
+
+These tests run on small synthetic images, so they need neither a browser
+nor network access.
+"""
+import os
+import sys
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import image_utils
+from utils.image_utils import (
+    _ssim, clear_image_cache, compare_image_bytes, compare_images, compare_images_batch, encode_image, find_template, load_baseline_image
+)
+
+
+def write_image(path, image):
+    """Write an image to disk and return its path as a string."""
+    cv2.imwrite(str(path), image)
+    return str(path)
+
+
+@pytest.fixture
+def page_image():
+    """A white 200x120 'page' with a dark box in it."""
+    image = np.full((120, 200, 3), 255, dtype=np.uint8)
+    cv2.rectangle(image, (40, 30), (100, 80), (40, 40, 40), -1)
+    return image
+
+
+class TestLoadBaselineImage:
+    """Test the load_baseline_image function."""
+    
+    def test_load_baseline_image_reuses_decoded_pixels(self, tmp_path, page_image):
+        """Test that repeated loads of an unchanged file return the cached array."""
+        path = write_image(tmp_path / "baseline.png", page_image)
+        
+        first = load_baseline_image(path)
+        second = load_baseline_image(path)
+        
+        assert first is second
+        assert not first.flags.writeable
+    
+    def test_load_baseline_image_reloads_modified_file(self, tmp_path, page_image):
+        """Test that re-capturing a baseline invalidates the cached pixels."""
+        path = write_image(tmp_path / "baseline.png", page_image)
+        first = load_baseline_image(path)
+        
+        write_image(tmp_path / "baseline.png", 255 - page_image)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = load_baseline_image(path)
+        
+        assert first is not second
+        assert np.array_equal(second, 255 - page_image)
+    
+    def test_load_baseline_image_grayscale_is_cached(self, tmp_path, page_image):
+        """Test that the grayscale conversion is cached alongside the colour pixels."""
+        path = write_image(tmp_path / "baseline.png", page_image)
+        
+        first = load_baseline_image(path, grayscale=True)
+        second = load_baseline_image(path, grayscale=True)
+        
+        assert first is second
+        assert first.shape == page_image.shape[:2]
+        assert not first.flags.writeable
+    
+    def test_clear_image_cache(self, tmp_path, page_image):
+        """Test that clearing the cache makes the next load decode the file again."""
+        path = write_image(tmp_path / "baseline.png", page_image)
+        first = load_baseline_image(path)
+        
+        clear_image_cache()
+        
+        assert load_baseline_image(path) is not first
+    
+    def test_load_baseline_image_missing_file(self, tmp_path):
+        """Test that a missing baseline raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_baseline_image(str(tmp_path / "missing.png"))
+    
+    @pytest.mark.parametrize("content", [b"", b"not an image"], ids=["empty", "corrupt"])
+    def test_load_baseline_image_unreadable_file(self, tmp_path, content):
+        """Test that a file that isn't an image raises ValueError."""
+        path = tmp_path / "baseline.png"
+        path.write_bytes(content)
+        
+        with pytest.raises(ValueError):
+            load_baseline_image(str(path))
+
+
+class TestCompareImages:
+    """Test the compare_images function."""
+    
+    def test_compare_identical_images(self, tmp_path, page_image):
+        """Test that identical pixels score 1.0 even when the files are encoded differently."""
+        current = write_image(tmp_path / "current.png", page_image)
+        baseline = str(tmp_path / "baseline.png")
+        cv2.imwrite(baseline, page_image, [cv2.IMWRITE_PNG_COMPRESSION, 9])
+        
+        score, diff_image = compare_images(current, baseline)
+        
+        assert score == 1.0
+        assert diff_image is None  # Passing comparisons don't draw a diff
+    
+    def test_compare_byte_identical_files(self, tmp_path, page_image):
+        """Test that byte-identical files short-circuit without decoding."""
+        current = write_image(tmp_path / "current.png", page_image)
+        baseline = write_image(tmp_path / "baseline.png", page_image)
+        
+        with patch.object(image_utils, "load_image", side_effect=AssertionError("decoded")):
+            score, diff_image = compare_images(current, baseline)
+        
+        assert score == 1.0
+        assert diff_image is None
+    
+    def test_compare_different_images(self, tmp_path, page_image):
+        """Test that a visual change lowers the score and writes a diff image."""
+        changed = page_image.copy()
+        cv2.rectangle(changed, (120, 30), (180, 100), (0, 0, 0), -1)
+        current = write_image(tmp_path / "current.png", changed)
+        baseline = write_image(tmp_path / "baseline.png", page_image)
+        diff_path = str(tmp_path / "diff.png")
+        
+        score, diff_image = compare_images(current, baseline, output_path=diff_path)
+        
+        assert score < 0.95
+        assert os.path.exists(diff_path)
+        assert diff_image.shape == page_image.shape
+        # The changed region is boxed in red
+        assert np.all(diff_image == (0, 0, 255), axis=2).any()
+
+    def test_compare_images_decodes_colour_baseline_only_for_diff(self, tmp_path, page_image):
+        """Test that the colour baseline is only decoded when a difference image is drawn."""
+        clear_image_cache()
+        changed = page_image.copy()
+        cv2.rectangle(changed, (120, 30), (180, 100), (0, 0, 0), -1)
+        baseline = write_image(tmp_path / "baseline.png", page_image)
+        same = str(tmp_path / "same.png")
+        cv2.imwrite(same, page_image, [cv2.IMWRITE_PNG_COMPRESSION, 9])
+        
+        compare_images(same, baseline)
+        assert image_utils._load_image_cached.cache_info().currsize == 0
+        
+        compare_images(write_image(tmp_path / "changed.png", changed), baseline)
+        assert image_utils._load_image_cached.cache_info().currsize == 1
+    
+    def test_compare_passing_images_with_output_path(self, tmp_path, page_image):
+        """Test that a passing comparison still saves and returns a diff when an output path is given."""
+        current = write_image(tmp_path / "current.png", page_image)
+        baseline = write_image(tmp_path / "baseline.png", page_image)
+        diff_path = str(tmp_path / "diff.png")
+        
+        score, diff_image = compare_images(current, baseline, output_path=diff_path)
+        
+        assert score == 1.0
+        assert diff_image.shape == page_image.shape
+        assert os.path.exists(diff_path)
+
+class TestCompareImagesBatch:
+    """Test the compare_images_batch function."""
+    
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_compare_images_batch_matches_compare_images(self, tmp_path, page_image, max_workers):
+        """Test that batch results match one-at-a-time comparisons, in pair order."""
+        changed = page_image.copy()
+        cv2.rectangle(changed, (120, 30), (180, 100), (0, 0, 0), -1)
+        baseline = write_image(tmp_path / "baseline.png", page_image)
+        (tmp_path / "other").mkdir()
+        pairs = [
+            (write_image(tmp_path / "same.png", page_image), baseline),
+            (write_image(tmp_path / "changed.png", changed), baseline),
+            (write_image(tmp_path / "other" / "changed.png", changed), baseline),
+        ]
+        diff_dir = tmp_path / "diff"
+        diff_dir.mkdir()
+        
+        results = compare_images_batch(pairs, output_dir=str(diff_dir), max_workers=max_workers)
+        
+        assert [score for score, _ in results] == [compare_images(*pair)[0] for pair in pairs]
+        # Screenshots with the same name still get separate diff images
+        assert sorted(os.listdir(diff_dir)) == ["changed_2_diff.png", "changed_diff.png", "same_diff.png"]
+
+
+class TestSsim:
+    """Test the OpenCV SSIM implementation."""
+    
+    # Reference scores and map samples at (0, 0), (30, 45), (10, 80) and
+    # (63, 95), computed once with skimage.metrics.structural_similarity
+    # (scikit-image 0.26) on the fixed inputs built by ssim_pair
+    SKIMAGE_REFERENCE = {
+        "block": (0.9239685159, (1.0, 0.7117161062, 1.0, 1.0)),
+        "noise": (0.5274955983, (0.2026084387, 0.4830511038, 0.5368076742, 0.9150370178)),
+        "shift": (-0.0688326279, (0.1180755061, 0.5668844660, -0.4666849315, 0.9817782988)),
+    }
+    
+    @staticmethod
+    def ssim_pair(case):
+        """Build a deterministic 64x96 grayscale image pair without any RNG or drawing calls."""
+        y, x = np.mgrid[0:64, 0:96]
+        gradient = ((x * 2 + y) % 256).astype(np.uint8)
+        texture = ((x * 73 + y * 151 + x * y * 7) % 256).astype(np.uint8)
+        if case == "block":
+            changed = gradient.copy()
+            changed[20:40, 30:60] = 90
+            return gradient, changed
+        if case == "noise":
+            return gradient, np.clip(gradient.astype(int) + texture // 8, 0, 255).astype(np.uint8)
+        return texture, np.roll(texture, 1, axis=1)
+    
+    @pytest.mark.parametrize("case", ["block", "noise", "shift"])
+    def test_ssim_matches_scikit_image(self, case):
+        """Test that scores and maps agree with scikit-image's structural_similarity."""
+        expected_score, expected_samples = self.SKIMAGE_REFERENCE[case]
+        
+        score, ssim_map = _ssim(*self.ssim_pair(case))
+        
+        assert score == pytest.approx(expected_score, abs=1e-6)
+        samples = [ssim_map[0, 0], ssim_map[30, 45], ssim_map[10, 80], ssim_map[63, 95]]
+        assert samples == pytest.approx(expected_samples, abs=1e-4)
+    
+    def test_ssim_identical_images(self, page_image):
+        """Test that identical images score exactly 1.0."""
+        gray = cv2.cvtColor(page_image, cv2.COLOR_BGR2GRAY)
+        
+        score, _ = _ssim(gray, gray)
+        
+        assert score == 1.0
+
+
+class TestCompareImageBytes:
+    """Test the compare_image_bytes function."""
+    
+    def test_compare_image_bytes_identical_pixels(self, tmp_path, page_image):
+        """Test that an in-memory screenshot matching the baseline scores 1.0."""
+        baseline = str(tmp_path / "baseline.png")
+        cv2.imwrite(baseline, page_image, [cv2.IMWRITE_PNG_COMPRESSION, 9])
+        png_bytes = cv2.imencode(".png", page_image)[1].tobytes()
+        
+        score, diff_image = compare_image_bytes(png_bytes, baseline)
+        
+        assert score == pytest.approx(1.0)
+        assert diff_image is None
+    
+    def test_compare_image_bytes_byte_identical(self, tmp_path, page_image):
+        """Test that bytes matching the baseline file short-circuit without decoding."""
+        baseline = write_image(tmp_path / "baseline.png", page_image)
+        with open(baseline, "rb") as f:
+            png_bytes = f.read()
+        
+        score, diff_image = compare_image_bytes(png_bytes, baseline)
+        
+        assert score == 1.0
+        assert diff_image is None
+    
+    def test_compare_image_bytes_hashes_baseline_once(self, tmp_path, page_image):
+        """Test that the baseline's digest is reused until the file changes."""
+        clear_image_cache()
+        baseline = write_image(tmp_path / "baseline.png", page_image)
+        with open(baseline, "rb") as f:
+            png_bytes = f.read()
+        
+        for _ in range(3):
+            compare_image_bytes(png_bytes, baseline)
+        
+        info = image_utils._file_digest_cached.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+    
+    def test_compare_image_bytes_webp_baseline_skips_digest(self, tmp_path, page_image):
+        """Test that a WebP baseline is never hashed, since PNG bytes can't match it."""
+        baseline = str(tmp_path / "baseline.webp")
+        cv2.imwrite(baseline, page_image, [cv2.IMWRITE_WEBP_QUALITY, 101])
+        
+        with patch.object(image_utils, "file_digest", side_effect=AssertionError("hashed")):
+            score, _ = compare_image_bytes(cv2.imencode(".png", page_image)[1].tobytes(), baseline)
+        
+        assert score == pytest.approx(1.0)
+    
+    def test_compare_image_bytes_different_images(self, tmp_path, page_image):
+        """Test that a visual change lowers the score and writes a diff image."""
+        changed = page_image.copy()
+        cv2.rectangle(changed, (120, 30), (180, 100), (0, 0, 0), -1)
+        baseline = write_image(tmp_path / "baseline.png", page_image)
+        diff_path = str(tmp_path / "diff.png")
+        
+        score, _ = compare_image_bytes(cv2.imencode(".png", changed)[1].tobytes(), baseline, output_path=diff_path)
+        
+        assert score < 0.95
+        assert os.path.exists(diff_path)
+    
+    def test_compare_image_bytes_uses_predecoded_baseline(self, tmp_path, page_image):
+        """Test that baseline pixels decoded ahead of time are compared instead of the file."""
+        baseline = write_image(tmp_path / "baseline.png", page_image)
+        changed = page_image.copy()
+        cv2.rectangle(changed, (120, 30), (180, 100), (0, 0, 0), -1)
+        png_bytes = cv2.imencode(".png", changed, [cv2.IMWRITE_PNG_COMPRESSION, 9])[1].tobytes()
+        
+        score, _ = compare_image_bytes(png_bytes, baseline, baseline_image=changed)
+        
+        assert score == pytest.approx(1.0)
+    
+    def test_compare_image_bytes_webp_baseline_identical_pixels(self, tmp_path, page_image):
+        """Test that a PNG screenshot of an unchanged page matches a WebP baseline exactly."""
+        baseline = str(tmp_path / "baseline.webp")
+        with open(baseline, "wb") as f:
+            f.write(encode_image(cv2.imencode(".png", page_image)[1].tobytes(), "webp"))
+        png_bytes = cv2.imencode(".png", page_image, [cv2.IMWRITE_PNG_COMPRESSION, 9])[1].tobytes()
+        
+        score, diff_image = compare_image_bytes(png_bytes, baseline)
+        
+        assert score == 1.0
+        assert diff_image is None
+    
+    def test_compare_image_bytes_invalid_screenshot(self, tmp_path, page_image):
+        """Test that undecodable bytes raise ValueError."""
+        baseline = write_image(tmp_path / "baseline.png", page_image)
+        
+        with pytest.raises(ValueError, match="Failed to decode image"):
+            compare_image_bytes(b"not a png", baseline)
+
+
+class TestFindTemplate:
+    """Test the find_template function."""
+    
+    @pytest.fixture
+    def textured_page(self):
+        """A 600x400 blurred-noise 'page', so every patch of it is distinctive."""
+        rng = np.random.default_rng(0)
+        return cv2.GaussianBlur(rng.integers(0, 256, (400, 600, 3), dtype=np.uint8), (0, 0), 3)
+    
+    @pytest.mark.parametrize("region", [(213, 147, 120, 48), (20, 300, 24, 24)], ids=["coarse-to-fine", "full-scale"])
+    def test_find_template_locates_region(self, tmp_path, textured_page, region):
+        """Test that large templates (searched coarse-to-fine) and small ones are found exactly."""
+        x, y, w, h = region
+        screenshot = write_image(tmp_path / "screenshot.png", textured_page)
+        template = write_image(tmp_path / "template.png", textured_page[y:y + h, x:x + w])
+        
+        assert find_template(screenshot, template) == region
+    
+    def test_find_template_no_match(self, tmp_path, textured_page):
+        """Test that a template that isn't in the screenshot returns None."""
+        screenshot = write_image(tmp_path / "screenshot.png", textured_page)
+        other = np.random.default_rng(1).integers(0, 256, (40, 60, 3), dtype=np.uint8)
+        template = write_image(tmp_path / "template.png", cv2.GaussianBlur(other, (0, 0), 3))
+        
+        assert find_template(screenshot, template) is None
+    
+    def test_find_template_prefers_exact_copy(self, tmp_path, textured_page):
+        """Test that a near-copy peaking higher at quarter scale doesn't beat the exact copy."""
+        x, y, w, h = 213, 147, 120, 48
+        template = textured_page[y:y + h, x:x + w].copy()
+        noise = np.random.default_rng(2).integers(-6, 7, template.shape)
+        textured_page[20:20 + h, 40:40 + w] = np.clip(template.astype(int) + noise, 0, 255).astype(np.uint8)
+        screenshot = write_image(tmp_path / "screenshot.png", textured_page)
+        
+        assert find_template(screenshot, write_image(tmp_path / "template.png", template)) == (x, y, w, h)
+    
+    def test_find_template_skips_full_search_without_candidates(self, tmp_path, textured_page):
+        """Test that a template nothing resembles at quarter scale isn't searched again at full scale."""
+        checkers = (np.indices((40, 60)).sum(axis=0) // 10 % 2 * 255).astype(np.uint8)
+        screenshot = write_image(tmp_path / "screenshot.png", textured_page)
+        template = write_image(tmp_path / "template.png", cv2.cvtColor(checkers, cv2.COLOR_GRAY2BGR))
+        
+        with patch.object(cv2, "matchTemplate", wraps=cv2.matchTemplate) as match_template:
+            assert find_template(screenshot, template) is None
+        
+        assert match_template.call_count == 1
+    
+    @pytest.mark.parametrize("color, expected", [(False, (20, 20, 40, 40)), (True, (120, 20, 40, 40))], ids=["grayscale", "color"])
+    def test_find_template_color(self, tmp_path, color, expected):
+        """Test that only a colour match tells apart patterns that look the same in grayscale."""
+        page = np.full((100, 200, 3), 255, dtype=np.uint8)
+        checkers = np.indices((40, 40)).sum(axis=0) // 8 % 2 == 0
+        # Green (0, 100, 0) and red (0, 0, 196) have the same grayscale value
+        page[20:60, 20:60][checkers] = (0, 100, 0)
+        page[20:60, 120:160][checkers] = (0, 0, 196)
+        screenshot = write_image(tmp_path / "screenshot.png", page)
+        template = write_image(tmp_path / "template.png", page[20:60, 120:160])
+        
+        assert find_template(screenshot, template, color=color) == expected
+
+
+class TestOpenCL:
+    """Test that SSIM and template matching give the same results through cv2.UMat."""
+    
+    @pytest.fixture
+    def enable_opencl(self, monkeypatch):
+        """Return a function that routes images through cv2.UMat; without an OpenCL device OpenCV runs those calls on the CPU."""
+        def enable():
+            monkeypatch.setattr(image_utils, "USE_OPENCL", True)
+            monkeypatch.setattr(cv2.ocl, "haveOpenCL", lambda: True)
+        return enable
+    
+    def test_ssim_through_umat(self, page_image, enable_opencl):
+        """Test that SSIM through cv2.UMat matches the ndarray result."""
+        gray = cv2.cvtColor(page_image, cv2.COLOR_BGR2GRAY)
+        changed = gray.copy()
+        changed[50:90, 120:180] = 0
+        expected_score, expected_map = _ssim(gray, changed)
+        
+        enable_opencl()
+        score, ssim_map = _ssim(gray, changed)
+        
+        assert isinstance(ssim_map, np.ndarray)
+        assert score == pytest.approx(expected_score, abs=1e-6)
+        assert np.allclose(ssim_map, expected_map, atol=1e-4)
+    
+    @pytest.mark.parametrize("region", [(213, 147, 120, 48), (20, 300, 24, 24)], ids=["coarse-to-fine", "full-scale"])
+    def test_find_template_through_umat(self, tmp_path, region, enable_opencl):
+        """Test that template matching through cv2.UMat finds the same region."""
+        page = cv2.GaussianBlur(np.random.default_rng(0).integers(0, 256, (400, 600, 3), dtype=np.uint8), (0, 0), 3)
+        x, y, w, h = region
+        screenshot = write_image(tmp_path / "screenshot.png", page)
+        template = write_image(tmp_path / "template.png", page[y:y + h, x:x + w])
+        
+        enable_opencl()
+        assert find_template(screenshot, template) == region
+
+
+class TestEncodeImage:
+    """Test the encode_image function."""
+    
+    def test_encode_image_png_is_passthrough(self, page_image):
+        """Test that PNG screenshots are stored as captured."""
+        png_bytes = cv2.imencode(".png", page_image)[1].tobytes()
+        
+        assert encode_image(png_bytes, "png") is png_bytes
+    
+    def test_encode_image_webp_is_lossless(self, tmp_path, page_image):
+        """Test that WebP baselines decode to the same pixels as the screenshot."""
+        png_bytes = cv2.imencode(".png", page_image)[1].tobytes()
+        path = tmp_path / "baseline.webp"
+        path.write_bytes(encode_image(png_bytes, "webp"))
+        
+        assert np.array_equal(cv2.imread(str(path)), page_image)
+    
+    def test_encode_image_unsupported_format(self, page_image):
+        """Test that an unknown format is rejected."""
+        png_bytes = cv2.imencode(".png", page_image)[1].tobytes()
+        
+        with pytest.raises(ValueError, match="Unsupported image format"):
+            encode_image(png_bytes, "bmp")
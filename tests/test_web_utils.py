@@ -0,0 +1,427 @@
+"""
+Test suite for Selenium utility functions.
+
+These tests use mock drivers, so they need neither a browser nor
+network access.
+"""
+import os
+import sys
+import base64
+import json
+import shutil
+import subprocess
+from unittest.mock import MagicMock, patch
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import web_utils
+from utils.web_utils import get_screenshot_png, wait_for_page_load_complete
+
+
+@pytest.fixture
+def driver_cache(tmp_path, monkeypatch):
+    """Point the ChromeDriver cache at a temp dir and fake a Chrome install."""
+    chrome = tmp_path / "chrome"
+    chrome.write_text("")
+    chromedriver = tmp_path / "chromedriver"
+    chromedriver.write_text("")
+    chromedriver.chmod(0o755)
+    cache_file = tmp_path / "driver.json"
+    
+    monkeypatch.setattr(web_utils, "DAEMON_DIR", str(tmp_path))
+    monkeypatch.setattr(web_utils, "DRIVER_CACHE_FILE", str(cache_file))
+    monkeypatch.setattr(web_utils, "find_chrome_binary", lambda: str(chrome))
+    web_utils._get_chromedriver_path.cache_clear()
+    yield chrome, chromedriver, cache_file
+    web_utils._get_chromedriver_path.cache_clear()
+
+
+def run_page_script(page, script, *args):
+    """
+    Run an async page script under Node.js against a fake page.
+    
+    Args:
+        page (str): JavaScript that sets up the fake page's globals
+        script (str): Async script, as passed to execute_async_script
+        *args (str): Script arguments as JavaScript expressions; the
+            callback is added as the last one
+        
+    Returns:
+        dict: The value passed to the callback and the elapsed time in ms
+    """
+    runner = page + f"""
+    const start = Date.now();
+    new Function({json.dumps(script)})({", ".join(args)}, value => {{
+        console.log(JSON.stringify({{value, elapsed: Date.now() - start}}));
+        process.exit(0);
+    }});
+    """
+    output = subprocess.run(["node", "-e", runner], capture_output=True, text=True, timeout=10, check=True)
+    return json.loads(output.stdout)
+
+
+class TestGetChromedriverPath:
+    """Test the _get_chromedriver_path function."""
+    
+    def test_get_chromedriver_path_saves_resolved_path(self, driver_cache):
+        """Test that a resolved driver path is written to the cache file."""
+        chrome, chromedriver, cache_file = driver_cache
+        
+        with patch("webdriver_manager.chrome.ChromeDriverManager") as manager:
+            manager.return_value.install.return_value = str(chromedriver)
+            assert web_utils._get_chromedriver_path() == str(chromedriver)
+        
+        assert json.loads(cache_file.read_text())["chromedriver"] == str(chromedriver)
+    
+    def test_get_chromedriver_path_skips_install_when_cached(self, driver_cache):
+        """Test that a valid cache entry skips webdriver-manager."""
+        chrome, chromedriver, cache_file = driver_cache
+        with patch("webdriver_manager.chrome.ChromeDriverManager") as manager:
+            manager.return_value.install.return_value = str(chromedriver)
+            web_utils._get_chromedriver_path()
+        web_utils._get_chromedriver_path.cache_clear()
+        
+        with patch("webdriver_manager.chrome.ChromeDriverManager") as manager:
+            assert web_utils._get_chromedriver_path() == str(chromedriver)
+            manager.assert_not_called()
+    
+    def test_get_chromedriver_path_resolves_again_after_chrome_update(self, driver_cache):
+        """Test that a changed Chrome executable invalidates the cache."""
+        chrome, chromedriver, cache_file = driver_cache
+        cache_file.write_text(json.dumps({"chrome": f"{chrome}:0", "chromedriver": str(chromedriver)}))
+        
+        with patch("webdriver_manager.chrome.ChromeDriverManager") as manager:
+            manager.return_value.install.return_value = str(chromedriver)
+            web_utils._get_chromedriver_path()
+            manager.return_value.install.assert_called_once()
+
+
+class TestChromeOptions:
+    """Test the _chrome_options function."""
+    
+    def test_chrome_options_reused_for_same_configuration(self):
+        """Test that drivers with the same configuration share one options object."""
+        assert web_utils._chrome_options(True, False, None) is web_utils._chrome_options(True, False, None)
+        assert web_utils._chrome_options(True, False, None) is not web_utils._chrome_options(False, False, None)
+    
+    def test_chrome_options_launch_arguments(self):
+        """Test the arguments used when launching a new browser."""
+        options = web_utils._chrome_options(True, True, None)
+        
+        assert "--headless=new" in options.arguments
+        assert "--window-size=1920,1080" in options.arguments
+        assert options.experimental_options["prefs"] == {"profile.managed_default_content_settings.images": 2}
+    
+    def test_chrome_options_daemon_attach(self):
+        """Test that attaching to the daemon only sets the debugger address."""
+        options = web_utils._chrome_options(True, False, "127.0.0.1:9222")
+        
+        assert options.arguments == []
+        assert options.experimental_options == {"debuggerAddress": "127.0.0.1:9222"}
+    
+    def test_chrome_options_page_load_strategy(self):
+        """Test that the configured page load strategy is requested."""
+        assert web_utils._chrome_options(True, False, None).page_load_strategy == web_utils.PAGE_LOAD_STRATEGY
+
+
+class TestGetDriver:
+    """Test the get_driver and close_all_drivers functions."""
+    
+    @pytest.fixture
+    def create_driver(self, monkeypatch):
+        """Replace create_driver with one that returns mock drivers."""
+        create = MagicMock(side_effect=lambda *args, **kwargs: MagicMock())
+        monkeypatch.setattr(web_utils, "create_driver", create)
+        monkeypatch.setattr(web_utils, "_shared_drivers", {})
+        return create
+    
+    def test_get_driver_reuses_driver(self, create_driver):
+        """Test that calls with the same settings share one driver."""
+        driver = web_utils.get_driver(headless=True)
+        
+        assert web_utils.get_driver(headless=True) is driver
+        assert web_utils.get_driver(headless=False) is not driver
+        assert create_driver.call_count == 2
+    
+    def test_get_driver_replaces_dead_driver(self, create_driver):
+        """Test that a driver whose driver process has exited is replaced."""
+        driver = web_utils.get_driver()
+        driver.service.is_connectable.return_value = False
+        
+        assert web_utils.get_driver() is not driver
+    
+    def test_release_driver_keeps_shared_driver(self, create_driver):
+        """Test that releasing a shared driver only clears its browser state."""
+        driver = web_utils.get_driver()
+        with patch.object(web_utils, "clear_browser_state") as clear_browser_state:
+            web_utils.release_driver(driver)
+        
+        clear_browser_state.assert_called_once_with(driver)
+        driver.quit.assert_not_called()
+    
+    def test_close_all_drivers(self, create_driver):
+        """Test that close_all_drivers quits every shared driver."""
+        drivers = [web_utils.get_driver(headless=True), web_utils.get_driver(headless=False)]
+        drivers[0].quit.side_effect = Exception("browser already gone")
+        for driver in drivers:
+            driver._daemon_session = False
+        web_utils.close_all_drivers()
+        
+        for driver in drivers:
+            driver.quit.assert_called_once()
+        assert web_utils._shared_drivers == {}
+
+
+class TestGetScreenshotPng:
+    """Test the get_screenshot_png function."""
+    
+    def test_get_screenshot_png_uses_devtools(self):
+        """Test that Chromium drivers capture through Page.captureScreenshot."""
+        driver = MagicMock()
+        driver.execute_cdp_cmd.return_value = {"data": base64.b64encode(b"png-bytes").decode()}
+        
+        assert get_screenshot_png(driver) == b"png-bytes"
+        driver.execute_cdp_cmd.assert_called_once_with("Page.captureScreenshot", {"format": "png"})
+        driver.get_screenshot_as_png.assert_not_called()
+    
+    def test_get_screenshot_png_falls_back_without_devtools(self):
+        """Test that non-Chromium drivers use a regular screenshot."""
+        driver = MagicMock(spec=["get_screenshot_as_png"])
+        driver.get_screenshot_as_png.return_value = b"png-bytes"
+        
+        assert get_screenshot_png(driver) == b"png-bytes"
+
+
+class TestTakeScreenshot:
+    """Test the take_screenshot function."""
+    
+    def test_take_screenshot_writes_in_background(self, tmp_path, monkeypatch):
+        """Test that a screenshot is written to a new folder once pending writes are waited on."""
+        monkeypatch.setattr(web_utils, "get_screenshot_png", lambda driver: b"png")
+        folder = tmp_path / "nested" / "folder"
+        
+        path = web_utils.take_screenshot(MagicMock(), "page.png", folder=str(folder), wait=False)
+        
+        assert web_utils.wait_for_screenshot_writes() == []
+        assert path == str(folder / "page.png")
+        assert (folder / "page.png").read_bytes() == b"png"
+
+
+class TestScrollToElement:
+    """Test the scroll_to_element function."""
+    
+    @patch("utils.web_utils.time.sleep")
+    def test_scroll_to_element_waits_in_page(self, sleep):
+        """Test that scrolling and waiting for the element to settle is one script call."""
+        driver = MagicMock()
+        driver.execute_async_script.return_value = True
+        element = MagicMock()
+        
+        assert web_utils.scroll_to_element(driver, element) is True
+        driver.execute_async_script.assert_called_once_with(web_utils._SCROLL_SETTLED_SCRIPT, element, 2)
+        sleep.assert_not_called()
+    
+    @pytest.mark.skipif(shutil.which("node") is None, reason="needs Node.js to run the page script")
+    @pytest.mark.parametrize("steps, settled", [(4, True), (None, False)], ids=["smooth-scroll", "always-moving"])
+    def test_scroll_settled_script(self, steps, settled):
+        """Test that the wait ends once the element stops moving, or gives up on one that never does."""
+        page = f"""
+        let top = 400, frames = 0;
+        global.requestAnimationFrame = callback => setTimeout(() => {{
+            frames += 1;
+            // A smooth scroll that moves the element for a few frames, or an endless animation
+            if ({json.dumps(steps)} === null || frames <= {json.dumps(steps)}) top -= 100;
+            callback();
+        }}, 16);
+        global.element = {{
+            scrollIntoView: () => {{}},
+            getBoundingClientRect: () => ({{top, left: 0, width: 10, height: 10}}),
+        }};
+        """
+        result = run_page_script(page, web_utils._SCROLL_SETTLED_SCRIPT, "element", "0.3")
+        
+        assert result["value"] is settled
+
+
+class TestWaitForPageLoadComplete:
+    """Test the wait_for_page_load_complete function."""
+    
+    @patch("utils.web_utils.time.sleep")
+    def test_wait_for_page_load_complete_single_round_trip(self, sleep):
+        """Test that the page is waited on with one script call and no fixed sleep."""
+        driver = MagicMock()
+        driver.execute_async_script.return_value = True
+        
+        assert wait_for_page_load_complete(driver, timeout=5) is True
+        driver.execute_async_script.assert_called_once_with(web_utils._PAGE_SETTLED_SCRIPT, 5)
+        driver.execute_script.assert_not_called()
+        sleep.assert_not_called()
+    
+    @patch("utils.web_utils.time.sleep")
+    def test_wait_for_page_load_complete_settle(self, sleep):
+        """Test that a settle time is waited out after the page loads."""
+        driver = MagicMock()
+        driver.execute_async_script.return_value = True
+        
+        wait_for_page_load_complete(driver, settle=0.5)
+        sleep.assert_called_once_with(0.5)
+    
+    def test_wait_for_page_load_complete_sets_script_timeout(self):
+        """Test that the driver's script timeout is set above the in-page deadline, once per driver."""
+        driver = MagicMock()
+        driver.execute_async_script.return_value = True
+        
+        wait_for_page_load_complete(driver, timeout=30)
+        wait_for_page_load_complete(driver, timeout=30)
+        
+        driver.set_script_timeout.assert_called_once_with(30 + web_utils._SCRIPT_TIMEOUT_MARGIN)
+    
+    def test_wait_for_page_load_complete_not_loaded(self):
+        """Test that a page whose readyState never reaches 'complete' raises TimeoutException."""
+        driver = MagicMock()
+        driver.execute_async_script.return_value = False
+        
+        with pytest.raises(TimeoutException):
+            wait_for_page_load_complete(driver)
+    
+    @pytest.mark.parametrize("ready_state, loaded", [("complete", True), ("interactive", False)])
+    def test_wait_for_page_load_complete_script_timeout(self, ready_state, loaded):
+        """Test that a script that never reports back only fails the wait if the page isn't loaded."""
+        driver = MagicMock()
+        driver.execute_async_script.side_effect = TimeoutException("script timeout")
+        driver.execute_script.return_value = ready_state
+        
+        if loaded:
+            assert wait_for_page_load_complete(driver) is True
+        else:
+            with pytest.raises(TimeoutException):
+                wait_for_page_load_complete(driver)
+    
+    @pytest.mark.skipif(shutil.which("node") is None, reason="needs Node.js to run the page script")
+    def test_page_settled_script_persistent_spinner(self):
+        """Test that a loaded page with a spinner that never goes away passes once the deadline is reached."""
+        page = """
+        global.document = {
+            readyState: 'complete',
+            querySelector: () => ({}),  // A spinner that never goes away
+            fonts: {ready: new Promise(() => {})},  // Fonts that never finish loading
+        };
+        global.window = global;
+        global.requestAnimationFrame = () => {};  // A tab that never paints
+        """
+        result = run_page_script(page, web_utils._PAGE_SETTLED_SCRIPT, "0.3")
+        
+        assert result["value"] is True
+        assert result["elapsed"] < 1000
+
+
+class TestClearBrowserState:
+    """Test cases for clear_browser_state."""
+    
+    def test_clears_all_cookies_and_framed_origins(self):
+        """Test that Chromium clears every cookie and each framed origin's storage."""
+        driver = MagicMock()
+        frame_tree = {"frameTree": {
+            "frame": {"securityOrigin": "https://example.com"},
+            "childFrames": [
+                {"frame": {"securityOrigin": "https://ads.example.net"}},
+                {"frame": {"securityOrigin": "null"}},
+            ],
+        }}
+        driver.execute_cdp_cmd.side_effect = lambda cmd, params: frame_tree if cmd == "Page.getFrameTree" else {}
+        
+        web_utils.clear_browser_state(driver)
+        
+        calls = [call.args for call in driver.execute_cdp_cmd.call_args_list]
+        assert ("Network.clearBrowserCookies", {}) in calls
+        cleared = {params["origin"] for cmd, params in calls if cmd == "Storage.clearDataForOrigin"}
+        assert cleared == {"https://example.com", "https://ads.example.net"}
+        assert all(params["storageTypes"] == "all" for cmd, params in calls if cmd == "Storage.clearDataForOrigin")
+        driver.delete_all_cookies.assert_not_called()
+    
+    def test_falls_back_without_devtools(self):
+        """Test that browsers without DevTools clear cookies and web storage through WebDriver."""
+        driver = MagicMock(spec=["delete_all_cookies", "execute_script"])
+        
+        web_utils.clear_browser_state(driver)
+        
+        driver.delete_all_cookies.assert_called_once()
+        assert "localStorage.clear()" in driver.execute_script.call_args.args[0]
+
+
+class TestFillForm:
+    """Test the fill_form function."""
+    
+    def test_fill_form_single_script(self, capsys):
+        """Test that every field is filled by one script call and missing fields are reported."""
+        driver = MagicMock()
+        driver.execute_script.return_value = [["#missing"], []]
+        
+        web_utils.fill_form(driver, {"#name": "Ada", "#age": 36, "#missing": "x"})
+        
+        driver.execute_script.assert_called_once_with(
+            web_utils._FILL_FORM_SCRIPT, [["#name", "Ada"], ["#age", "36"], ["#missing", "x"]])
+        driver.find_element.assert_not_called()
+        assert capsys.readouterr().out == "Warning: Field not found: #missing\n"
+    
+    def test_fill_form_types_into_file_inputs(self):
+        """Test that fields the script can't set are typed into, without clearing file inputs."""
+        driver = MagicMock()
+        driver.execute_script.return_value = [[], [["#upload", False], ["#editor", True]]]
+        upload, editor = MagicMock(), MagicMock()
+        driver.find_element.side_effect = lambda by, selector: {"#upload": upload, "#editor": editor}[selector]
+        
+        web_utils.fill_form(driver, {"#name": "Ada", "#upload": "/tmp/cv.pdf", "#editor": "Hello"})
+        
+        upload.clear.assert_not_called()
+        upload.send_keys.assert_called_once_with("/tmp/cv.pdf")
+        editor.clear.assert_called_once()
+        editor.send_keys.assert_called_once_with("Hello")
+    
+    def test_fill_form_type_keys(self, capsys):
+        """Test that type_keys types into every field instead of running the script."""
+        driver = MagicMock()
+        field = MagicMock()
+        driver.find_element.side_effect = [field, NoSuchElementException()]
+        
+        web_utils.fill_form(driver, {"#name": "Ada", "#missing": "x"}, type_keys=True)
+        
+        driver.execute_script.assert_not_called()
+        field.clear.assert_called_once()
+        field.send_keys.assert_called_once_with("Ada")
+        assert capsys.readouterr().out == "Warning: Field not found: #missing\n"
+    
+    @pytest.mark.skipif(shutil.which("node") is None, reason="needs Node.js to run the page script")
+    def test_fill_form_script(self):
+        """Test that the script sets values through the prototype setter and reports the fields it can't set."""
+        page = """
+        class Field {
+            constructor(type) { this.type = type; this.events = []; this._value = ''; }
+            get value() { return this._value; }
+            set value(value) { this._value = value; }
+            focus() {}
+            dispatchEvent(event) { this.events.push([event.constructor.name, event.type, event.data ?? null]); }
+        }
+        global.InputEvent = class InputEvent extends Event {
+            constructor(type, init) { super(type, init); this.data = init.data; }
+        };
+        global.fields = {'#name': new Field('text'), '#upload': new Field('file'), '#editor': {focus() {}}};
+        global.document = {querySelector: selector => fields[selector] || null};
+        """
+        # Wrap the synchronous script so its return value goes to the callback
+        script = (
+            "const done = arguments[arguments.length - 1];"
+            f"const result = (function () {{ {web_utils._FILL_FORM_SCRIPT} }}).apply(null, arguments);"
+            "done({result, name: fields['#name'].value, events: fields['#name'].events});"
+        )
+        pairs = json.dumps([["#name", "Ada"], ["#upload", "/tmp/cv.pdf"], ["#editor", "Hello"], ["#missing", "x"]])
+        
+        value = run_page_script(page, script, pairs)["value"]
+        
+        assert value["result"] == [["#missing"], [["#upload", False], ["#editor", True]]]
+        assert value["name"] == "Ada"
+        assert value["events"] == [["InputEvent", "input", "Ada"], ["Event", "change", None]]
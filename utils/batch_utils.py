@@ -0,0 +1,59 @@
+"""
+Batch manifest utilities for baseline-cli.
+
+A manifest is a JSON list of jobs that are run in a single browser session:
+
+    [
+        {"url": "http://localhost:3000", "name": "homepage", "mode": "page"},
+        {"url": "http://localhost:3000", "name": "button", "mode": "element", "selector": "button"},
+        {"url": "http://localhost:3000", "name": "text-box", "mode": "element", "class": "text-box"}
+    ]
+"""
+import os
+import json
+
+
+def load_manifest(manifest_path):
+    """
+    Load and validate a batch manifest.
+
+    Args:
+        manifest_path (str): Path to the JSON manifest file
+
+    Returns:
+        list: Job dicts with "url", "name" and "mode" keys, plus "selector"
+            or "class" for element jobs
+
+    Raises:
+        FileNotFoundError: If the manifest file doesn't exist
+        ValueError: If the manifest isn't a valid list of jobs
+    """
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+
+    with open(manifest_path, encoding="utf-8") as f:
+        try:
+            jobs = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid manifest: {e}")
+
+    if not isinstance(jobs, list) or not jobs:
+        raise ValueError("Invalid manifest: expected a non-empty list of jobs")
+
+    seen = set()
+    for index, job in enumerate(jobs, start=1):
+        if not isinstance(job, dict):
+            raise ValueError(f"Invalid manifest: job {index} is not an object")
+        if not job.get("url") or not job.get("name"):
+            raise ValueError(f"Invalid manifest: job {index} needs a url and a name")
+        job.setdefault("mode", "page")
+        if job["mode"] not in ("page", "element"):
+            raise ValueError(f"Invalid manifest: job {index} has unknown mode '{job['mode']}'")
+        if job["mode"] == "element" and not job.get("selector") and not job.get("class"):
+            raise ValueError(f"Invalid manifest: job {index} needs a selector or class for element mode")
+        # Jobs with the same name and mode would write over each other's images
+        if (job["name"], job["mode"]) in seen:
+            raise ValueError(f"Invalid manifest: job {index} repeats the {job['mode']} job named '{job['name']}'")
+        seen.add((job["name"], job["mode"]))
+
+    return jobs
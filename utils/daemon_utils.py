@@ -0,0 +1,237 @@
+"""
+Browser daemon utilities for baseline-cli.
+
+The daemon is a long-lived headless Chrome started with remote debugging
+enabled. While it is running, capture and compare commands attach to it
+instead of launching a new browser on every invocation.
+"""
+import os
+import json
+import time
+import shutil
+import signal
+import subprocess
+import urllib.request
+from urllib.parse import urlparse
+
+from config.config import (
+    CHROME_BINARY,
+    DAEMON_DIR,
+    DAEMON_ENDPOINT_FILE,
+    DAEMON_PID_FILE,
+    DAEMON_PORT,
+    DEFAULT_TIMEOUT,
+    HEADLESS,
+    WINDOW_SIZE
+)
+
+# Common Chrome install locations, checked in order
+CHROME_CANDIDATES = (
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+)
+
+
+def find_chrome_binary():
+    """
+    Locate a Chrome executable to run the daemon with.
+
+    Returns:
+        str: Path to the Chrome executable, or None if none was found
+    """
+    if CHROME_BINARY:
+        return CHROME_BINARY
+
+    for candidate in CHROME_CANDIDATES:
+        path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if path and os.path.exists(path):
+            return path
+
+    return None
+
+
+def _fetch_version_info(address, timeout=0.5):
+    """
+    Query Chrome's DevTools `/json/version` endpoint.
+
+    Args:
+        address (str): Debugger address in `host:port` form
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        dict: Parsed version info, or None if the browser is unreachable
+    """
+    try:
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def get_daemon_address():
+    """
+    Get the debugger address of the running browser daemon.
+
+    A browser only counts as the daemon if the recorded PID is still the
+    Chrome that `start_daemon` launched, so commands never attach to some
+    other browser that happens to listen on the same port.
+
+    Returns:
+        str: Debugger address in `host:port` form, or None if no daemon is running
+    """
+    if not os.path.exists(DAEMON_ENDPOINT_FILE):
+        return None
+
+    pid = _read_daemon_pid()
+    if pid is None or not _is_daemon_process(pid):
+        return None
+
+    with open(DAEMON_ENDPOINT_FILE) as f:
+        endpoint = f.read().strip()
+
+    address = urlparse(endpoint).netloc
+    if not address or _fetch_version_info(address) is None:
+        return None
+
+    return address
+
+
+def start_daemon(port=DAEMON_PORT, headless=HEADLESS, timeout=DEFAULT_TIMEOUT):
+    """
+    Start the browser daemon, or return the endpoint of the one already running.
+
+    Args:
+        port (int): Remote debugging port for Chrome
+        headless (bool): Whether to run Chrome in headless mode
+        timeout (int): Maximum time to wait for Chrome to accept connections
+
+    Returns:
+        str: The daemon's `webSocketDebuggerUrl`
+
+    Raises:
+        FileNotFoundError: If no Chrome executable can be found
+        RuntimeError: If another browser already listens on the port, or
+            Chrome exits before accepting connections
+        TimeoutError: If Chrome doesn't start within the timeout
+    """
+    if get_daemon_address() is not None:
+        with open(DAEMON_ENDPOINT_FILE) as f:
+            return f.read().strip()
+
+    chrome_binary = find_chrome_binary()
+    if chrome_binary is None:
+        raise FileNotFoundError("Chrome executable not found, set CHROME_BINARY in config/config.py")
+
+    address = f"127.0.0.1:{port}"
+    if _fetch_version_info(address) is not None:
+        raise RuntimeError(f"Another browser is already listening on {address}, stop it or change DAEMON_PORT in config/config.py")
+
+    # Start from an empty profile so nothing a previous daemon stored carries over
+    profile_dir = os.path.join(DAEMON_DIR, "profile")
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    os.makedirs(DAEMON_DIR, exist_ok=True)
+    command = [
+        chrome_binary,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={profile_dir}",
+        f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}",
+        "--no-sandbox",
+        "--no-first-run",
+    ]
+    if headless:
+        command.append("--headless=new")
+    command.append("about:blank")
+
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        info = _fetch_version_info(address)
+        # Chrome exits straight away if it can't bind the port, and whatever
+        # answers then isn't the browser that was just launched
+        if process.poll() is not None:
+            raise RuntimeError(f"Chrome exited before accepting connections on {address}")
+        if info is not None:
+            endpoint = info["webSocketDebuggerUrl"]
+            with open(DAEMON_ENDPOINT_FILE, "w") as f:
+                f.write(endpoint)
+            with open(DAEMON_PID_FILE, "w") as f:
+                f.write(str(process.pid))
+            return endpoint
+        time.sleep(0.1)
+
+    process.terminate()
+    raise TimeoutError(f"Chrome didn't accept connections on {address}")
+
+
+def _read_daemon_pid():
+    """
+    Read the daemon's process ID from its PID file.
+
+    Returns:
+        int: The recorded process ID, or None if the file is missing or corrupt
+    """
+    try:
+        with open(DAEMON_PID_FILE) as f:
+            pid = int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+    return pid if pid > 0 else None
+
+
+def _is_daemon_process(pid):
+    """
+    Check that a process is the Chrome started by `start_daemon`.
+
+    The PID file can outlive the daemon, and the PID can be reused by an
+    unrelated process, so the command line must still name the daemon's
+    profile directory.
+
+    Args:
+        pid (int): Process ID to check
+
+    Returns:
+        bool: True if the process is running and is the daemon
+    """
+    try:
+        result = subprocess.run(
+            ["ps", "-ww", "-p", str(pid), "-o", "command="],
+            capture_output=True,
+            text=True
+        )
+    except OSError:
+        return False
+
+    return f"--user-data-dir={os.path.join(DAEMON_DIR, 'profile')}" in result.stdout
+
+
+def stop_daemon():
+    """
+    Stop the browser daemon and remove its endpoint files.
+
+    Returns:
+        bool: True if a running daemon was stopped
+    """
+    stopped = False
+    pid = _read_daemon_pid()
+    if pid is not None and _is_daemon_process(pid):
+        try:
+            os.kill(pid, signal.SIGTERM)
+            stopped = True
+        except ProcessLookupError:
+            pass  # Daemon exited since it was checked
+
+    for path in (DAEMON_ENDPOINT_FILE, DAEMON_PID_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+
+    return stopped
@@ -5,11 +5,59 @@ This module provides consistent error handling and output formatting
 across all CLI commands and scripts.
 """
 import sys
-from rich.console import Console
+import threading
+import contextlib
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
 
 console = Console()
+_spinners_enabled = True
+
+_PANEL_TITLES = {
+    "capture": "Baseline Capture Summary",
+    "compare": "Baseline Comparison Summary",
+}
+
+def disable_spinners():
+    """Turn off the status spinners shown by `console_status` for this process."""
+    global _spinners_enabled
+    _spinners_enabled = False
+
+def console_status(message):
+    """
+    Show a spinner while a step is running.
+    
+    Rich allows only one live display at a time, so spinners are only shown
+    on the main thread; steps run from worker threads show nothing until
+    they print their own completion message. When output isn't a terminal
+    (CI logs, pipes) or spinners were turned off with `disable_spinners`,
+    no spinner is started.
+    
+    Args:
+        message (str): Status message to display next to the spinner
+        
+    Returns:
+        A context manager wrapping the step
+    """
+    if _spinners_enabled and console.is_terminal and threading.current_thread() is threading.main_thread():
+        return console.status(message, spinner="dots", spinner_style="white")
+    return contextlib.nullcontext()
+
+def _summary_table(result, duration, similarity_score=None):
+    """Build the Result/Duration table shown in every summary panel."""
+    table = Table(show_header=False, box=None)
+    table.add_row("Result", result)
+    table.add_row("Duration", f"{duration:.2f} seconds")
+    if similarity_score is not None:
+        table.add_row("Similarity Score", f"{similarity_score * 100:.2f}%")
+    return table
+
+def _print_summary(renderable, operation_type, preamble=()):
+    """Print a summary panel titled for the operation type, after any preamble lines, in one write."""
+    panel_title = _PANEL_TITLES.get(operation_type.lower(), _PANEL_TITLES["capture"])
+    
+    console.print(Group(*preamble, "", Panel(renderable, title=panel_title, expand=False)))
 
 def handle_cli_error(message, operation_type="capture", duration=0.0, result="Failed", exit_code=1):
     """
@@ -22,24 +70,7 @@ def handle_cli_error(message, operation_type="capture", duration=0.0, result="Fa
         result (str): Result status ("Failed", "Error", "Cancelled")
         exit_code (int): Exit code to use when calling sys.exit()
     """
-    # Determine the appropriate panel title based on operation type
-    if operation_type.lower() == "compare":
-        panel_title = "Baseline Comparison Summary"
-    else:
-        panel_title = "Baseline Capture Summary"
-    
-    # Print error message
-    console.print()
-    console.print(f"[bold red]{message}")
-    
-    # Create and display summary table
-    table = Table(show_header=False, box=None)
-    table.add_row("Result", result)
-    table.add_row("Duration", f"{duration:.2f} seconds")
-    console.print()
-    console.print(Panel(table, title=panel_title, expand=False))
-    
-    sys.exit(exit_code)
+    handle_multiple_cli_errors([message], operation_type, duration, result, exit_code)
 
 def handle_multiple_cli_errors(messages, operation_type="capture", duration=0.0, result="Failed", exit_code=1):
     """
@@ -52,24 +83,9 @@ def handle_multiple_cli_errors(messages, operation_type="capture", duration=0.0,
         result (str): Result status ("Failed", "Error", "Cancelled")
         exit_code (int): Exit code to use when calling sys.exit()
     """
-    # Determine the appropriate panel title based on operation type
-    if operation_type.lower() == "compare":
-        panel_title = "Baseline Comparison Summary"
-    else:
-        panel_title = "Baseline Capture Summary"
-    
-    # Print all error messages
-    console.print()
-    for message in messages:
-        console.print(f"[bold red]{message}")
-    
-    # Create and display summary table
-    table = Table(show_header=False, box=None)
-    table.add_row("Result", result)
-    table.add_row("Duration", f"{duration:.2f} seconds")
-    console.print()
-    console.print(Panel(table, title=panel_title, expand=False))
-    
+    # Print all error messages above the summary
+    preamble = ["", *(f"[bold red]{message}" for message in messages)]
+    _print_summary(_summary_table(result, duration), operation_type, preamble)
     sys.exit(exit_code)
 
 def format_function_error(message, duration=0.0, result="Failed"):
@@ -97,18 +113,37 @@ def display_success_summary(result, duration, similarity_score=None, operation_t
         similarity_score (float, optional): Similarity score for comparisons
         operation_type (str): Type of operation ("capture" or "compare")
     """
-    # Determine the appropriate panel title based on operation type
-    if operation_type.lower() == "compare":
-        panel_title = "Baseline Comparison Summary"
-    else:
-        panel_title = "Baseline Capture Summary"
+    _print_summary(_summary_table(result, duration, similarity_score), operation_type)
+
+def display_batch_summary(results, duration, operation_type="capture"):
+    """
+    Display a batch summary with one row per job.
     
-    table = Table(show_header=False, box=None)
-    table.add_row("Result", result)
-    table.add_row("Duration", f"{duration:.2f} seconds")
+    Args:
+        results (list): Job results as dicts with "name", "result" and
+            "duration" keys, plus "similarity_score" for comparisons
+        duration (float): Total duration of the batch
+        operation_type (str): Type of operation ("capture" or "compare")
+        
+    Returns:
+        str: Overall result, "Success" only if every job succeeded
+    """
+    show_scores = any(r.get("similarity_score") is not None for r in results)
+    jobs_table = Table(box=None)
+    jobs_table.add_column("Name")
+    jobs_table.add_column("Result")
+    jobs_table.add_column("Duration")
+    if show_scores:
+        jobs_table.add_column("Similarity Score")
     
-    if similarity_score is not None:
-        table.add_row("Similarity Score", f"{similarity_score * 100:.2f}%")
+    for r in results:
+        row = [r["name"], r["result"], f"{r['duration']:.2f} seconds"]
+        if show_scores:
+            score = r.get("similarity_score")
+            row.append(f"{score * 100:.2f}%" if score is not None else "-")
+        jobs_table.add_row(*row)
+    
+    overall = "Success" if results and all(r["result"] == "Success" for r in results) else "Failed"
+    _print_summary(Group(jobs_table, "", _summary_table(overall, duration)), operation_type)
     
-    console.print()
-    console.print(Panel(table, title=panel_title, expand=False)) 
\ No newline at end of file
+    return overall
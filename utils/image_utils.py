@@ -2,115 +2,533 @@
 OpenCV image processing utilities for visual testing.
 """
 import os
+import hashlib
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
-from PIL import Image
-from skimage.metrics import structural_similarity as ssim
 
+from config.config import USE_OPENCL
 
-def load_image(image_path):
+
+def encode_image(png_bytes, image_format="png"):
+    """
+    Re-encode a PNG screenshot in the given image format.
+    
+    Args:
+        png_bytes (bytes): Encoded PNG image
+        image_format (str): Target format, "png" or "webp" (lossless)
+        
+    Returns:
+        bytes: The encoded image
+        
+    Raises:
+        ValueError: If the format is unsupported or the image can't be encoded
+    """
+    if image_format == "png":
+        return png_bytes
+    if image_format != "webp":
+        raise ValueError(f"Unsupported image format: {image_format}")
+    
+    image = cv2.imdecode(np.frombuffer(png_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    # A WebP quality above 100 selects lossless encoding
+    ok, encoded = cv2.imencode(".webp", image, [cv2.IMWRITE_WEBP_QUALITY, 101])
+    if not ok:
+        raise ValueError("Failed to encode image as WebP")
+    return encoded.tobytes()
+
+
+def load_image(image_path, flags=cv2.IMREAD_COLOR):
     """
     Load an image using OpenCV.
     
     Args:
         image_path (str): Path to the image file
+        flags (int): cv2.imdecode flags, e.g. cv2.IMREAD_GRAYSCALE to skip
+            decoding the colour planes
         
     Returns:
-        ndarray: Loaded image in BGR format
+        ndarray: Loaded image in BGR format, or single-channel for grayscale flags
     """
     if not os.path.exists(image_path):
         raise FileNotFoundError(f"Image file not found: {image_path}")
     
-    # Load image in BGR format (OpenCV default)
-    image = cv2.imread(image_path)
+    # Read the file in one go and decode from memory, rather than letting
+    # imread issue many small reads, which is slow on network filesystems
+    data = np.fromfile(image_path, dtype=np.uint8)
+    # Load image in BGR format (OpenCV default) unless asked otherwise
+    image = cv2.imdecode(data, flags) if data.size else None
     if image is None:
         raise ValueError(f"Failed to load image: {image_path}")
     
     return image
 
 
+@functools.lru_cache(maxsize=16)
+def _load_image_cached(image_path, mtime_ns, size):
+    image = load_image(image_path)
+    image.setflags(write=False)
+    return image
+
+
+@functools.lru_cache(maxsize=16)
+def _load_gray_cached(image_path, mtime_ns, size):
+    gray = load_image(image_path, cv2.IMREAD_GRAYSCALE)
+    gray.setflags(write=False)
+    return gray
+
+
+def load_baseline_image(image_path, grayscale=False):
+    """
+    Load a baseline image, reusing the decoded pixels across calls.
+    
+    Cache entries are keyed by the file's modification time and size, so
+    a re-captured baseline is decoded again.
+    
+    Args:
+        image_path (str): Path to the image file
+        grayscale (bool): Return the image decoded straight to grayscale
+        
+    Returns:
+        ndarray: Read-only image in BGR format, or single-channel if grayscale
+    """
+    if not os.path.exists(image_path):
+        raise FileNotFoundError(f"Image file not found: {image_path}")
+    
+    stat = os.stat(image_path)
+    loader = _load_gray_cached if grayscale else _load_image_cached
+    return loader(image_path, stat.st_mtime_ns, stat.st_size)
+
+
+def clear_image_cache():
+    """Forget every baseline image decoded by `load_baseline_image` and every cached file digest."""
+    _load_image_cached.cache_clear()
+    _load_gray_cached.cache_clear()
+    _file_digest_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=16)
+def _file_digest_cached(path, mtime_ns, size):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def file_digest(path):
+    """
+    Compute the SHA-256 digest of a file's bytes.
+    
+    Digests are cached by the file's modification time and size, like
+    decoded baselines, so a baseline is only read and hashed once.
+    
+    Args:
+        path (str): Path to the file
+        
+    Returns:
+        str: Hex digest of the file contents
+    """
+    stat = os.stat(path)
+    return _file_digest_cached(path, stat.st_mtime_ns, stat.st_size)
+
+
+def decode_image(image_bytes, flags=cv2.IMREAD_COLOR):
+    """
+    Decode an encoded image held in memory.
+    
+    Args:
+        image_bytes (bytes): Encoded image, e.g. a PNG screenshot
+        flags (int): cv2.imdecode flags, e.g. cv2.IMREAD_GRAYSCALE
+        
+    Returns:
+        ndarray: Decoded image in BGR format, or single-channel for grayscale flags
+    """
+    image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), flags)
+    if image is None:
+        raise ValueError("Failed to decode image")
+    
+    return image
+
+
+def _to_device(image):
+    """
+    Wrap an image as a cv2.UMat so OpenCV runs the calls on it through
+    OpenCL, when `USE_OPENCL` is set and OpenCL is available.
+    
+    Args:
+        image (ndarray): Image to hand to OpenCV
+        
+    Returns:
+        The image as a cv2.UMat, or unchanged when OpenCL isn't in use
+    """
+    if USE_OPENCL and cv2.ocl.haveOpenCL():
+        return cv2.UMat(image)
+    return image
+
+
+# SSIM constants for 8-bit images, matching scikit-image's structural_similarity defaults
+_SSIM_WINDOW = 7
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+
+
+def _ssim(gray1, gray2):
+    """
+    Compute the structural similarity of two grayscale images.
+    
+    Same result as scikit-image's `structural_similarity(gray1, gray2, full=True)`
+    with its defaults (7x7 uniform window, sample covariance), but the window
+    means come from OpenCV's box filter on float32 buffers.
+    
+    Args:
+        gray1 (ndarray): First grayscale image
+        gray2 (ndarray): Second grayscale image of the same shape
+        
+    Returns:
+        tuple: (mean_ssim, ssim_map)
+    """
+    x = _to_device(gray1.astype(np.float32))
+    y = _to_device(gray2.astype(np.float32))
+    
+    def window_mean(image):
+        return cv2.boxFilter(image, -1, (_SSIM_WINDOW, _SSIM_WINDOW), dst=image, borderType=cv2.BORDER_REFLECT)
+    
+    # Window means of x², y² and xy; the products are filtered in place
+    mean_xx = window_mean(cv2.multiply(x, x))
+    mean_yy = window_mean(cv2.multiply(y, y))
+    mean_xy = window_mean(cv2.multiply(x, y))
+    mu_x = window_mean(x)
+    mu_y = window_mean(y)
+    
+    # The arithmetic below reuses these full-size float32 buffers through
+    # dst=, rather than allocating a new temporary for every operation
+    mu_xx = cv2.multiply(mu_x, mu_x)
+    mu_yy = cv2.multiply(mu_y, mu_y)
+    mu_xy = cv2.multiply(mu_x, mu_y, dst=mu_x)
+    # Sample covariance over the window
+    cov_norm = _SSIM_WINDOW ** 2 / (_SSIM_WINDOW ** 2 - 1)
+    
+    # Numerator: (2 μxy + C1) * (2 σxy + C2)
+    cov_xy = cv2.subtract(mean_xy, mu_xy, dst=mean_xy)
+    cv2.addWeighted(cov_xy, 2 * cov_norm, cov_xy, 0, _SSIM_C2, dst=cov_xy)
+    cv2.addWeighted(mu_xy, 2, mu_xy, 0, _SSIM_C1, dst=mu_xy)
+    numerator = cv2.multiply(mu_xy, cov_xy, dst=mu_xy)
+    
+    # Denominator: (μx² + μy² + C1) * (σx² + σy² + C2)
+    var_sum = cv2.add(cv2.subtract(mean_xx, mu_xx, dst=mean_xx), cv2.subtract(mean_yy, mu_yy, dst=mean_yy), dst=mean_xx)
+    cv2.addWeighted(var_sum, cov_norm, var_sum, 0, _SSIM_C2, dst=var_sum)
+    mu_sq_sum = cv2.add(mu_xx, mu_yy, dst=mu_xx)
+    cv2.add(mu_sq_sum, _SSIM_C1, dst=mu_sq_sum)
+    denominator = cv2.multiply(mu_sq_sum, var_sum, dst=mu_sq_sum)
+    
+    ssim_map = cv2.divide(numerator, denominator, dst=numerator)
+    if isinstance(ssim_map, cv2.UMat):
+        ssim_map = ssim_map.get()
+    
+    # Like scikit-image, leave out the border where the window overhangs the image
+    pad = (_SSIM_WINDOW - 1) // 2
+    return float(ssim_map[pad:-pad, pad:-pad].mean(dtype=np.float64)), ssim_map
+
+
+def _current_image_flags(current_is_png, baseline_path):
+    """
+    Pick the decode flags for the image compared against a baseline.
+    
+    libpng converts to grayscale with slightly different rounding from
+    cv2.cvtColor, which other decoders use. Decoding the current image
+    straight to grayscale only lines up with the baseline's grayscale
+    when both are PNGs; otherwise it's decoded in colour and converted.
+    """
+    if current_is_png and baseline_path.lower().endswith(".png"):
+        return cv2.IMREAD_GRAYSCALE
+    return cv2.IMREAD_COLOR
+
+
+def _diff_images(img1, gray2, threshold, load_background, output_path=None):
+    """
+    Compute the SSIM score of two decoded images and draw their differences.
+    
+    Without an output_path, the difference image is only drawn when the
+    score is below the threshold, since nobody looks at the diff of a
+    passing comparison. The colour background it's drawn on is only loaded
+    when a difference image is drawn.
+    
+    Args:
+        img1 (ndarray): First image in BGR format or grayscale
+        gray2 (ndarray): Second image in grayscale, e.g. a cached baseline;
+            resized to match img1
+        threshold (float): Similarity threshold (0.0 to 1.0)
+        load_background (callable): Returns the second image in BGR format,
+            used as the background of the difference image
+        output_path (str, optional): Path to save difference image
+        
+    Returns:
+        tuple: (similarity_score, difference_image); difference_image is
+            None when the score meets the threshold and no output_path is
+            given, and may be the background itself when no region is big
+            enough to box, so treat it as read-only
+    """
+    size = (img1.shape[1], img1.shape[0])
+    
+    # Convert to grayscale and ensure same dimensions
+    gray1 = img1 if img1.ndim == 2 else cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
+    if gray2.shape != gray1.shape:
+        gray2 = cv2.resize(gray2, size)
+    
+    # Unchanged pages usually render pixel-for-pixel the same, even when the
+    # PNG bytes differ; a memcmp settles that without computing SSIM, which
+    # only looks at the grayscale pixels anyway
+    if np.array_equal(gray1, gray2):
+        score, diff = 1.0, None
+    else:
+        # Calculate structural similarity index
+        (score, diff) = _ssim(gray1, gray2)
+    if score >= threshold and output_path is None:
+        return score, None
+    
+    regions = []
+    if diff is not None:
+        # Create visual difference image
+        diff = (diff * 255).astype("uint8")
+        thresh = cv2.threshold(diff, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
+        
+        # Find the changed regions; one call returns every bounding box and area
+        _, _, stats, _ = cv2.connectedComponentsWithStats(thresh, connectivity=8)
+        regions = stats[1:]  # Row 0 is the background
+        regions = regions[regions[:, cv2.CC_STAT_AREA] > 40].tolist()  # Filter small differences
+    
+    background = load_background()
+    if background.shape[:2] != img1.shape[:2]:
+        background = cv2.resize(background, size)
+    
+    # Create diff image with bounding boxes; with none to draw, the
+    # background is returned as it is rather than copied
+    diff_image = background.copy() if len(regions) else background
+    for x, y, w, h, _ in regions:
+        cv2.rectangle(diff_image, (x, y), (x + w, y + h), (0, 0, 255), 2)
+    
+    if output_path is not None:
+        cv2.imwrite(output_path, diff_image)
+    
+    return score, diff_image
+
+
 def compare_images(img1_path, img2_path, threshold=0.95, output_path=None):
     """
     Compare two images and highlight differences.
     
     Args:
         img1_path (str): Path to first image
-        img2_path (str): Path to second image
+        img2_path (str): Path to second image, usually the baseline; its
+            grayscale pixels, and its colour pixels once a difference image
+            has been drawn on them, are cached between calls
         threshold (float): Similarity threshold (0.0 to 1.0)
         output_path (str, optional): Path to save difference image
         
     Returns:
-        tuple: (similarity_score, difference_image)
+        tuple: (similarity_score, difference_image); difference_image is
+            None when the score meets the threshold and no output_path is
+            given, in which case no difference image is drawn at all; it may
+            be the baseline's own read-only pixels when no difference is big
+            enough to box
     """
-    # Load images
-    img1 = load_image(img1_path)
-    img2 = load_image(img2_path)
+    # Byte-identical files can't differ visually, so skip decoding and SSIM;
+    # files of different sizes can't be, so they aren't hashed
+    if (output_path is None and os.path.getsize(img1_path) == os.path.getsize(img2_path)
+            and file_digest(img1_path) == file_digest(img2_path)):
+        return 1.0, None
     
-    # Ensure same dimensions
-    if img1.shape != img2.shape:
-        img2 = cv2.resize(img2, (img1.shape[1], img1.shape[0]))
+    flags = _current_image_flags(img1_path.lower().endswith(".png"), img2_path)
+    return _diff_images(load_image(img1_path, flags), load_baseline_image(img2_path, grayscale=True), threshold,
+                        lambda: load_baseline_image(img2_path), output_path)
+
+
+def compare_images_batch(pairs, threshold=0.95, output_dir=None, max_workers=None):
+    """
+    Compare several pairs of images on a thread pool.
     
-    # Convert to grayscale
-    gray1 = cv2.cvtColor(img1, cv2.COLOR_BGR2GRAY)
-    gray2 = cv2.cvtColor(img2, cv2.COLOR_BGR2GRAY)
+    OpenCV releases the GIL while it decodes, filters and converts, so the
+    pairs are compared in parallel with threads rather than processes.
     
-    # Calculate structural similarity index
-    (score, diff) = ssim(gray1, gray2, full=True)
+    Args:
+        pairs (list): (img1_path, img2_path) tuples, as passed to `compare_images`
+        threshold (float): Similarity threshold (0.0 to 1.0)
+        output_dir (str, optional): Directory to save difference images in,
+            each named `<img1 name>_diff.png`
+        max_workers (int, optional): Number of threads; defaults to the CPU count
+        
+    Returns:
+        list: (similarity_score, difference_image) tuples, in pair order
+    """
+    output_paths = [None] * len(pairs)
+    if output_dir is not None:
+        used = set()
+        for index, (img1_path, _) in enumerate(pairs):
+            name = os.path.splitext(os.path.basename(img1_path))[0]
+            # Give every pair its own diff image, even if screenshots share a name
+            if name in used:
+                name = f"{name}_{index}"
+            used.add(name)
+            output_paths[index] = os.path.join(output_dir, f"{name}_diff.png")
     
-    # Create visual difference image
-    diff = (diff * 255).astype("uint8")
-    thresh = cv2.threshold(diff, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
+    def compare(index):
+        img1_path, img2_path = pairs[index]
+        return compare_images(img1_path, img2_path, threshold, output_paths[index])
     
-    # Find contours
-    contours = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    contours = contours[0] if len(contours) == 2 else contours[1]
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pairs))
+    if max_workers <= 1:
+        return [compare(index) for index in range(len(pairs))]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(compare, range(len(pairs))))
+
+
+def compare_image_bytes(image_bytes, baseline_path, threshold=0.95, output_path=None, baseline_image=None, baseline_gray=None):
+    """
+    Compare an in-memory screenshot with a baseline image on disk.
     
-    # Create diff image with bounding boxes
-    diff_image = img2.copy()
-    for c in contours:
-        area = cv2.contourArea(c)
-        if area > 40:  # Filter small differences
-            x, y, w, h = cv2.boundingRect(c)
-            cv2.rectangle(diff_image, (x, y), (x + w, y + h), (0, 0, 255), 2)
+    Same as `compare_images`, but the screenshot is decoded straight from
+    memory instead of being written to disk and read back first.
     
-    if output_path is not None:
-        cv2.imwrite(output_path, diff_image)
+    Args:
+        image_bytes (bytes): Encoded screenshot, e.g. PNG bytes from Selenium
+        baseline_path (str): Path to the baseline image; its grayscale
+            pixels, and its colour pixels once a difference image has been
+            drawn on them, are cached between calls
+        threshold (float): Similarity threshold (0.0 to 1.0)
+        output_path (str, optional): Path to save difference image
+        baseline_image (ndarray, optional): Baseline pixels decoded ahead of
+            time; without baseline_gray, they're converted to grayscale for
+            the comparison
+        baseline_gray (ndarray, optional): Baseline decoded ahead of time by
+            `load_baseline_image(baseline_path, grayscale=True)`, e.g. while
+            the page was loading
+        
+    Returns:
+        tuple: (similarity_score, difference_image); difference_image is
+            None when the score meets the threshold and no output_path is
+            given, in which case no difference image is drawn at all; it may
+            be the baseline's own read-only pixels when no difference is big
+            enough to box
+    """
+    # Byte-identical images can't differ visually, so skip decoding and SSIM.
+    # Screenshots are PNGs, so only a PNG baseline of the same size can match
+    if (output_path is None and baseline_path.lower().endswith(".png")
+            and len(image_bytes) == os.path.getsize(baseline_path)
+            and hashlib.sha256(image_bytes).hexdigest() == file_digest(baseline_path)):
+        return 1.0, None
     
-    return score, diff_image
+    if baseline_gray is None and baseline_image is not None:
+        # Converted with cvtColor, so the screenshot must be too
+        baseline_gray = cv2.cvtColor(baseline_image, cv2.COLOR_BGR2GRAY)
+        flags = cv2.IMREAD_COLOR
+    else:
+        if baseline_gray is None:
+            baseline_gray = load_baseline_image(baseline_path, grayscale=True)
+        # Screenshots from the browser are always PNGs
+        flags = _current_image_flags(True, baseline_path)
+    
+    def load_background():
+        return baseline_image if baseline_image is not None else load_baseline_image(baseline_path)
+    
+    return _diff_images(decode_image(image_bytes, flags), baseline_gray, threshold, load_background, output_path)
+
 
+# Templates smaller than this lose too much detail at quarter scale to search there
+_PYRAMID_MIN_TEMPLATE_SIZE = 32
+_PYRAMID_REFINE_PAD = 8
+_PYRAMID_REFINE_PEAKS = 3  # Quarter-scale peaks refined at full scale
+_PYRAMID_SKIP_MARGIN = 0.3  # Quarter-scale scores this far below the threshold rule out a match
 
-def find_template(screenshot_path, template_path, threshold=0.8):
+
+def _find_template_coarse_to_fine(screenshot, template, threshold):
+    """
+    Search a quarter-scale copy of the screenshot, then refine around its
+    strongest peaks at full scale.
+    
+    A repeated element can peak higher at quarter scale than the exact copy,
+    so the best few peaks are all refined and the best full-scale score wins.
+    
+    Returns:
+        tuple: (match, coarse_score) where match is (x, y, w, h) for the best
+            refined match meeting the threshold or None, and coarse_score is
+            the best quarter-scale score
+    """
+    h, w = template.shape[:2]
+    small_result = cv2.matchTemplate(
+        cv2.pyrDown(cv2.pyrDown(_to_device(screenshot))), cv2.pyrDown(cv2.pyrDown(_to_device(template))), cv2.TM_CCOEFF_NORMED)
+    if isinstance(small_result, cv2.UMat):
+        small_result = small_result.get()
+    
+    coarse_score = None
+    best_val, best_match = -1.0, None
+    for _ in range(_PYRAMID_REFINE_PEAKS):
+        _, peak_val, _, (cx, cy) = cv2.minMaxLoc(small_result)
+        if coarse_score is None:
+            coarse_score = peak_val
+        if peak_val < threshold - _PYRAMID_SKIP_MARGIN:
+            break
+        # Suppress the peak's neighbourhood so the next one is a different candidate
+        small_result[max(0, cy - h // 8):cy + h // 8 + 1, max(0, cx - w // 8):cx + w // 8 + 1] = -1
+        
+        # Scale the coarse match back up and search a small window around it
+        x0 = max(0, cx * 4 - _PYRAMID_REFINE_PAD)
+        y0 = max(0, cy * 4 - _PYRAMID_REFINE_PAD)
+        roi = screenshot[y0:cy * 4 + h + _PYRAMID_REFINE_PAD, x0:cx * 4 + w + _PYRAMID_REFINE_PAD]
+        if roi.shape[0] < h or roi.shape[1] < w:
+            continue
+        
+        _, max_val, _, (x, y) = cv2.minMaxLoc(cv2.matchTemplate(_to_device(roi), _to_device(template), cv2.TM_CCOEFF_NORMED))
+        if max_val > best_val:
+            best_val, best_match = max_val, (x0 + x, y0 + y, w, h)
+    
+    if best_val < threshold:
+        return None, coarse_score
+    return best_match, coarse_score
+
+
+def find_template(screenshot_path, template_path, threshold=0.8, color=False):
     """
     Find a template image within a screenshot.
     
+    Templates of at least 32x32 pixels are first searched for at quarter
+    scale; the full-resolution search only runs for smaller templates or
+    when the quarter-scale search comes close to a match without finding one.
+    
+    Both images are matched in grayscale, a third of the work of matching
+    all three colour channels, unless color is set.
+    
     Args:
         screenshot_path (str): Path to the screenshot
         template_path (str): Path to the template image to find
         threshold (float): Detection threshold (0.0 to 1.0)
+        color (bool): Whether to match in colour, for templates that only
+            differ from other parts of the page in hue
         
     Returns:
         tuple: (x, y, w, h) coordinates if found, None otherwise
     """
     # Load images
-    screenshot = load_image(screenshot_path)
-    template = load_image(template_path)
+    flags = cv2.IMREAD_COLOR if color else cv2.IMREAD_GRAYSCALE
+    screenshot = load_image(screenshot_path, flags)
+    template = load_image(template_path, flags)
     
     # Get dimensions
     h, w = template.shape[:2]
     
-    # Perform template matching
-    result = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+    if min(h, w) >= _PYRAMID_MIN_TEMPLATE_SIZE:
+        match, coarse_score = _find_template_coarse_to_fine(screenshot, template, threshold)
+        if match is not None:
+            return match
+        # A quarter-scale best this far below the threshold won't reach it at full scale
+        if coarse_score < threshold - _PYRAMID_SKIP_MARGIN:
+            return None
     
-    # Find positions where match exceeds threshold
-    locations = np.where(result >= threshold)
+    # Perform template matching
+    result = cv2.matchTemplate(_to_device(screenshot), _to_device(template), cv2.TM_CCOEFF_NORMED)
     
-    if len(locations[0]) == 0:
+    # The best match is the only one that matters, so check it against the threshold
+    _, max_val, _, top_left = cv2.minMaxLoc(result)
+    if max_val < threshold:
         return None
     
-    # Get the best match
-    _, _, _, max_loc = cv2.minMaxLoc(result)
-    top_left = max_loc
-    
     return (top_left[0], top_left[1], w, h)
 
 
@@ -3,6 +3,13 @@ Selenium utility functions for web automation and testing.
 """
 import os
 import time
+import json
+import base64
+import queue
+import atexit
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
@@ -11,18 +18,104 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 
+from config.config import DAEMON_DIR, DRIVER_CACHE_FILE, PAGE_LOAD_STRATEGY, WINDOW_SIZE
+from utils.daemon_utils import find_chrome_binary, get_daemon_address
 
-def create_driver(browser_type="chrome", headless=False):
+# Screenshots are written on a background pool so the browser can move on
+# to the next page while the previous image is flushed to disk
+_io_pool = ThreadPoolExecutor(max_workers=2)
+_pending_writes = []
+
+# Drivers handed out by get_driver, keyed by their configuration
+_shared_drivers = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_chromedriver_path():
+    """
+    Resolve the ChromeDriver executable, skipping webdriver-manager when possible.
+    
+    The resolved path is saved to `DRIVER_CACHE_FILE` along with the Chrome
+    executable's modification time, so later runs reuse it until Chrome is
+    updated.
+    
+    Returns:
+        str: Path to an executable ChromeDriver
+    """
+    chrome_binary = find_chrome_binary()
+    chrome_key = None
+    if chrome_binary and os.path.exists(chrome_binary):
+        chrome_key = f"{chrome_binary}:{os.stat(chrome_binary).st_mtime_ns}"
+        try:
+            with open(DRIVER_CACHE_FILE) as f:
+                cached = json.load(f)
+            if cached.get("chrome") == chrome_key and os.path.exists(cached.get("chromedriver", "")):
+                return cached["chromedriver"]
+        except (OSError, ValueError):
+            pass  # No usable cache, resolve the driver below
+    
+    # webdriver-manager pulls in requests, so it's only imported on a cache miss
+    from webdriver_manager.chrome import ChromeDriverManager
+    chromedriver_path = ChromeDriverManager().install()
+    if "THIRD_PARTY_NOTICES" in chromedriver_path:
+        driver_dir = os.path.dirname(chromedriver_path)
+        chromedriver_path = os.path.join(driver_dir, "chromedriver")
+    
+    # Ensure ChromeDriver is executable
+    if not os.stat(chromedriver_path).st_mode & 0o111:
+        os.chmod(chromedriver_path, 0o755)
+    
+    if chrome_key:
+        os.makedirs(DAEMON_DIR, exist_ok=True)
+        with open(DRIVER_CACHE_FILE, "w") as f:
+            json.dump({"chrome": chrome_key, "chromedriver": chromedriver_path}, f)
+    
+    return chromedriver_path
+
+
+@functools.lru_cache(maxsize=8)
+def _chrome_options(headless, block_images, daemon_address):
+    """
+    Build ChromeOptions for a configuration, reusing them for later drivers.
+    
+    Args:
+        headless (bool): Whether to run in headless mode
+        block_images (bool): Whether Chrome should skip loading images
+        daemon_address (str): Debugger address of the browser daemon to
+            attach to, or None to launch a new browser
+            
+    Returns:
+        ChromeOptions: Options for `webdriver.Chrome`; treat them as read-only
+    """
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = PAGE_LOAD_STRATEGY
+    if daemon_address:
+        options.add_experimental_option("debuggerAddress", daemon_address)
+        return options
+    
+    if headless:
+        options.add_argument("--headless=new")  # Updated headless mode syntax
+    options.add_argument(f"--window-size={WINDOW_SIZE[0]},{WINDOW_SIZE[1]}")
+    options.add_argument("--no-sandbox")
+    if block_images:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    return options
+
+
+def create_driver(browser_type="chrome", headless=False, use_daemon=True, block_images=False):
     """
     Create and configure a WebDriver instance.
     
+    When the browser daemon is running, Chrome drivers attach to it
+    instead of launching a new browser.
+    
     Args:
         browser_type (str): Type of browser ('chrome', 'firefox', or 'edge')
         headless (bool): Whether to run in headless mode
+        use_daemon (bool): Whether to attach to the browser daemon if it's running
+        block_images (bool): Whether Chrome should skip loading images; the
+            daemon's preferences can't be changed, so this launches a new browser
         
     Returns:
         WebDriver: Configured WebDriver instance
@@ -30,35 +123,26 @@ def create_driver(browser_type="chrome", headless=False):
     browser_type = browser_type.lower()
     
     if browser_type == "chrome":
-        options = webdriver.ChromeOptions()
-        if headless:
-            options.add_argument("--headless=new")  # Updated headless mode syntax
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--no-sandbox")
-        
-        # Get ChromeDriver path and ensure it's executable
-        chromedriver_path = ChromeDriverManager().install()
-        if "THIRD_PARTY_NOTICES" in chromedriver_path:
-            driver_dir = os.path.dirname(chromedriver_path)
-            chromedriver_path = os.path.join(driver_dir, "chromedriver")
-        
-        # Ensure ChromeDriver is executable
-        os.chmod(chromedriver_path, 0o755)
-        
-        service = ChromeService(chromedriver_path)
-        driver = webdriver.Chrome(service=service, options=options)
+        daemon_address = get_daemon_address() if use_daemon and not block_images else None
+        service = ChromeService(_get_chromedriver_path())
+        driver = webdriver.Chrome(service=service, options=_chrome_options(headless, block_images, daemon_address))
+        driver._daemon_session = daemon_address is not None
     
     elif browser_type == "firefox":
         options = webdriver.FirefoxOptions()
+        options.page_load_strategy = PAGE_LOAD_STRATEGY
         if headless:
             options.add_argument("--headless")
+        from webdriver_manager.firefox import GeckoDriverManager
         service = FirefoxService(GeckoDriverManager().install())
         driver = webdriver.Firefox(service=service, options=options)
     
     elif browser_type == "edge":
         options = webdriver.EdgeOptions()
+        options.page_load_strategy = PAGE_LOAD_STRATEGY
         if headless:
             options.add_argument("--headless")
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
         service = EdgeService(EdgeChromiumDriverManager().install())
         driver = webdriver.Edge(service=service, options=options)
     
@@ -72,6 +156,142 @@ def create_driver(browser_type="chrome", headless=False):
     return driver
 
 
+def _frame_origins(frame_tree):
+    """Collect the security origins of a `Page.getFrameTree` frame and its children."""
+    origins = {frame_tree["frame"].get("securityOrigin")}
+    for child in frame_tree.get("childFrames", []):
+        origins |= _frame_origins(child)
+    return origins
+
+
+def clear_browser_state(driver):
+    """
+    Clear the cookies and site data a job left behind in the browser.
+    
+    `delete_all_cookies` only reaches the current document's origin, so on
+    Chromium the whole cookie jar is cleared through DevTools, along with
+    every storage type (local storage, IndexedDB, cache storage, service
+    workers) of each origin framed by the current page. Other browsers fall
+    back to clearing cookies and web storage through WebDriver.
+    
+    Args:
+        driver (WebDriver): Selenium WebDriver instance
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        driver.delete_all_cookies()
+        driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        return
+    
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    frame_tree = driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]
+    for origin in _frame_origins(frame_tree):
+        # Opaque origins such as about:blank have no storage to clear
+        if origin and origin.startswith(("http://", "https://")):
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+
+
+def release_driver(driver):
+    """
+    Release a WebDriver instance once a command is done with it.
+    
+    Sessions attached to the browser daemon keep the browser running for the
+    next invocation and only have their cookies and site data cleared. Any other session
+    is shut down.
+    
+    Args:
+        driver (WebDriver): Selenium WebDriver instance
+    """
+    if getattr(driver, "_shared", False):
+        clear_browser_state(driver)
+    elif getattr(driver, "_daemon_session", False):
+        clear_browser_state(driver)
+        driver.service.stop()
+    else:
+        driver.quit()
+
+
+def get_driver(browser_type="chrome", headless=False, block_images=False):
+    """
+    Get a WebDriver that is reused by every later call with the same settings.
+    
+    Launching a browser takes seconds, so callers that run many captures or
+    comparisons in one process share a driver instead. `release_driver` only
+    clears a shared driver's cookies; it is shut down by `close_all_drivers`,
+    which runs at exit.
+    
+    Args:
+        browser_type (str): Type of browser ('chrome', 'firefox', or 'edge')
+        headless (bool): Whether to run in headless mode
+        block_images (bool): Whether Chrome should skip loading images
+        
+    Returns:
+        WebDriver: Shared WebDriver instance
+    """
+    key = (browser_type.lower(), headless, block_images)
+    driver = _shared_drivers.get(key)
+    # Launch a new driver if the old one's driver process has gone away
+    if driver is None or not driver.service.is_connectable():
+        driver = create_driver(browser_type, headless, block_images=block_images)
+        driver._shared = True
+        _shared_drivers[key] = driver
+    return driver
+
+
+def close_all_drivers():
+    """Shut down every driver handed out by `get_driver`."""
+    while _shared_drivers:
+        _, driver = _shared_drivers.popitem()
+        driver._shared = False
+        with contextlib.suppress(Exception):
+            release_driver(driver)
+
+
+atexit.register(close_all_drivers)
+
+
+class DriverPool:
+    """
+    A fixed set of WebDriver instances shared between worker threads.
+    
+    Every driver launches its own browser, even when the browser daemon is
+    running, so concurrent jobs never share a tab.
+    """
+    
+    def __init__(self, size, browser_type="chrome", headless=False):
+        """
+        Launch the pool's drivers in parallel.
+        
+        Args:
+            size (int): Number of drivers to launch
+            browser_type (str): Type of browser ('chrome', 'firefox', or 'edge')
+            headless (bool): Whether to run in headless mode
+        """
+        self.size = size
+        self._drivers = queue.Queue()
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            for driver in executor.map(lambda _: create_driver(browser_type, headless, use_daemon=False), range(size)):
+                self._drivers.put(driver)
+    
+    @contextlib.contextmanager
+    def acquire(self):
+        """
+        Borrow a driver for the duration of a `with` block.
+        
+        Yields:
+            WebDriver: A driver that no other thread is using
+        """
+        driver = self._drivers.get()
+        try:
+            yield driver
+        finally:
+            self._drivers.put(driver)
+    
+    def close(self):
+        """Quit every driver in the pool."""
+        while not self._drivers.empty():
+            release_driver(self._drivers.get_nowait())
+
+
 def wait_for_element(driver, selector, by=By.CSS_SELECTOR, timeout=10):
     """
     Wait for an element to be present on the page.
@@ -97,7 +317,98 @@ def wait_for_element(driver, selector, by=By.CSS_SELECTOR, timeout=10):
         raise TimeoutException(f"Element not found: {selector} (by {by})")
 
 
-def take_screenshot(driver, filename, folder=None):
+def wait_for_element_visible(driver, element, timeout=2):
+    """
+    Wait for an element that is already located to become visible.
+    
+    Args:
+        driver (WebDriver): Selenium WebDriver instance
+        element (WebElement): Element to wait for
+        timeout (int): Maximum wait time in seconds
+        
+    Returns:
+        WebElement: The visible element
+        
+    Raises:
+        TimeoutException: If element isn't visible within timeout
+    """
+    try:
+        return WebDriverWait(driver, timeout).until(EC.visibility_of(element))
+    except TimeoutException:
+        raise TimeoutException("Element not visible after scrolling into view")
+
+
+def _write_image(filepath, png_bytes, image_format):
+    # PNG screenshots are written as they are, so captures don't need OpenCV
+    if image_format == "png":
+        data = png_bytes
+    else:
+        from utils.image_utils import encode_image
+        data = encode_image(png_bytes, image_format)
+    with open(filepath, "wb") as f:
+        f.write(data)
+
+
+def save_image(png_bytes, filepath, wait=True, image_format="png"):
+    """
+    Write a PNG screenshot to disk on the background I/O pool.
+    
+    Args:
+        png_bytes (bytes): Encoded PNG image
+        filepath (str): Path to write the image to
+        wait (bool): Whether to block until the write finishes; otherwise
+            the write is tracked until `wait_for_screenshot_writes` is called
+        image_format (str): Format to store the image in ("png" or "webp")
+            
+    Returns:
+        str: Path the image is written to
+    """
+    future = _io_pool.submit(_write_image, filepath, png_bytes, image_format)
+    if wait:
+        future.result()
+    else:
+        _pending_writes.append(future)
+    return filepath
+
+
+def wait_for_screenshot_writes():
+    """
+    Block until every background screenshot write has finished.
+    
+    Returns:
+        list: Error messages for writes that failed
+    """
+    errors = []
+    while _pending_writes:
+        future = _pending_writes.pop()
+        try:
+            future.result()
+        except (OSError, ValueError) as e:
+            errors.append(f"Error saving screenshot: {e}")
+    return errors
+
+
+def get_screenshot_png(driver):
+    """
+    Capture the viewport as PNG bytes.
+    
+    Chromium drivers capture through the DevTools `Page.captureScreenshot`
+    command; other drivers fall back to a regular screenshot.
+    
+    Args:
+        driver: Selenium WebDriver instance
+            
+    Returns:
+        bytes: Encoded PNG image
+    """
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return driver.get_screenshot_as_png()
+    
+    result = driver.execute_cdp_cmd("Page.captureScreenshot", {"format": "png"})
+    return base64.b64decode(result["data"])
+
+
+def take_screenshot(driver, filename, folder=None, wait=True, image_format="png"):
     """
     Take a screenshot and save it to the specified folder.
     
@@ -105,61 +416,209 @@ def take_screenshot(driver, filename, folder=None):
         driver: Selenium WebDriver instance
         filename: Name of the screenshot file
         folder: Directory to save the screenshot
+        wait: Whether to block until the file is written (see `save_image`)
+        image_format: Format to store the screenshot in ("png" or "webp")
         
     Returns:
         str: Path to the saved screenshot
     """
-    # Create folder if it doesn't exist
-    if folder and not os.path.exists(folder):
-        os.makedirs(folder)
+    # Create folder if it doesn't exist; exist_ok also covers another worker creating it first
+    if folder:
+        os.makedirs(folder, exist_ok=True)
     
     # Generate full path
     filepath = os.path.join(folder, filename) if folder else filename
     
     # Take screenshot
-    driver.save_screenshot(filepath)
-    
-    return filepath
+    return save_image(get_screenshot_png(driver), filepath, wait=wait, image_format=image_format)
+
 
+# Scrolls arguments[0] into view, then calls back once its bounding box is
+# the same on two consecutive animation frames, or with false after
+# arguments[1] seconds
+_SCROLL_SETTLED_SCRIPT = """
+const element = arguments[0];
+const done = arguments[arguments.length - 1];
+const deadline = Date.now() + arguments[1] * 1000;
+// Background tabs don't paint, so don't wait on animation frames forever
+const frame = () => new Promise(resolve => {
+    requestAnimationFrame(resolve);
+    setTimeout(resolve, 100);
+});
+const box = () => {
+    const r = element.getBoundingClientRect();
+    return [r.top, r.left, r.width, r.height].join();
+};
+element.scrollIntoView(true);
+(async () => {
+    let last = box();
+    while (Date.now() < deadline) {
+        await frame();
+        const current = box();
+        if (current === last) {
+            return done(true);
+        }
+        last = current;
+    }
+    done(false);
+})();
+"""
 
-def scroll_to_element(driver, element):
+
+def scroll_to_element(driver, element, timeout=2):
     """
     Scroll to make an element visible.
     
+    Returns as soon as the element stops moving, so an instant scroll
+    costs a frame and a smooth scroll only as long as it runs.
+    
     Args:
         driver (WebDriver): Selenium WebDriver instance
         element (WebElement): Element to scroll to
+        timeout (float): Maximum time to wait for the scroll to finish, in seconds
+        
+    Returns:
+        bool: True if the element settled within the timeout
+    """
+    return driver.execute_async_script(_SCROLL_SETTLED_SCRIPT, element, timeout)
+
+
+# Sets each [selector, value] pair and returns [missing, typed]: the selectors
+# that matched nothing, and [selector, clear] pairs for fields whose value
+# can't be assigned from a script (file inputs, which can't be cleared, and
+# elements without a value, such as contenteditable ones), which fill_form
+# types into instead. The value goes through the prototype's
+# setter so frameworks that track the element's own value property (React)
+# see the change.
+_FILL_FORM_SCRIPT = """
+const missing = [];
+const typed = [];
+for (const [selector, value] of arguments[0]) {
+    const field = document.querySelector(selector);
+    if (!field) {
+        missing.push(selector);
+        continue;
+    }
+    if (field.type === 'file' || !('value' in field)) {
+        typed.push([selector, field.type !== 'file']);
+        continue;
+    }
+    field.focus();
+    const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(field), 'value')?.set;
+    if (setter) {
+        setter.call(field, value);
+    } else {
+        field.value = value;
+    }
+    field.dispatchEvent(new InputEvent('input', {bubbles: true, inputType: 'insertText', data: value}));
+    field.dispatchEvent(new Event('change', {bubbles: true}));
+}
+return [missing, typed];
+"""
+
+
+def _type_into_field(driver, selector, value, clear=True):
+    """
+    Fill in one field by typing into it with `send_keys`.
+    
+    Args:
+        driver (WebDriver): Selenium WebDriver instance
+        selector (str): CSS selector of the field
+        value (str): Value to type, or a file path for file inputs
+        clear (bool): Whether to clear the field first
     """
-    driver.execute_script("arguments[0].scrollIntoView(true);", element)
-    # Add a small delay to allow the page to settle after scrolling
-    time.sleep(0.5)
+    try:
+        field = driver.find_element(By.CSS_SELECTOR, selector)
+    except NoSuchElementException:
+        print(f"Warning: Field not found: {selector}")
+        return
+    if clear:
+        field.clear()
+    field.send_keys(value)
 
 
-def fill_form(driver, field_mappings):
+def fill_form(driver, field_mappings, type_keys=False):
     """
     Fill in a form using field mappings.
     
+    Fields are set by one script, so filling a form costs a single WebDriver
+    round trip. Values are assigned rather than typed: pages see `input` and
+    `change` events for each field, but no key events. File inputs and fields
+    without a value are still typed into with `send_keys`. Set type_keys for
+    forms whose listeners need key events, to type into every field.
+    
     Args:
         driver (WebDriver): Selenium WebDriver instance
         field_mappings (dict): Dictionary mapping field selectors to values
+        type_keys (bool): Whether to type into every field instead of
+            assigning values from a script
     """
-    for selector, value in field_mappings.items():
-        try:
-            field = driver.find_element(By.CSS_SELECTOR, selector)
-            field.clear()
-            field.send_keys(value)
-        except NoSuchElementException:
-            print(f"Warning: Field not found: {selector}")
+    values = {selector: str(value) for selector, value in field_mappings.items()}
+    if type_keys:
+        for selector, value in values.items():
+            _type_into_field(driver, selector, value)
+        return
+    
+    missing, typed = driver.execute_script(_FILL_FORM_SCRIPT, [list(pair) for pair in values.items()])
+    for selector in missing:
+        print(f"Warning: Field not found: {selector}")
+    for selector, clear in typed:
+        _type_into_field(driver, selector, values[selector], clear=clear)
+
+
+# Polls all of wait_for_page_load_complete's indicators inside the page and
+# calls back once they hold, the web fonts are in and two frames have been
+# painted. Only document.readyState is required: at the deadline the callback
+# gets whether it is 'complete', whatever the other indicators say, so a
+# spinner that never goes away ends the wait without failing it.
+_PAGE_SETTLED_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const deadline = Date.now() + arguments[0] * 1000;
+// Waits on the page are cut short at the deadline too
+const bounded = promise => Promise.race([
+    promise,
+    new Promise(resolve => setTimeout(resolve, Math.max(0, deadline - Date.now())))
+]);
+const loaded = () => document.readyState === 'complete';
+const settled = () => loaded()
+    && (typeof jQuery === 'undefined' || jQuery.active === 0)
+    && !document.querySelector('.loading, .animating, .spinner, [data-loading]')
+    && (!window.performance || performance.getEntriesByType('resource').filter(r => !r.responseEnd).length === 0);
+// Background tabs don't paint, so don't wait on animation frames forever
+const painted = () => new Promise(resolve => {
+    requestAnimationFrame(() => requestAnimationFrame(resolve));
+    setTimeout(resolve, 100);
+});
+(async () => {
+    while (!settled() && Date.now() < deadline) {
+        await new Promise(resolve => setTimeout(resolve, 50));
+    }
+    if (loaded()) {
+        if (document.fonts) await bounded(document.fonts.ready);
+        await painted();
+    }
+    done(loaded());
+})();
+"""
 
 
-def wait_for_page_load_complete(driver, timeout=30):
+# Seconds the driver's script timeout is set above the in-page deadline
+_SCRIPT_TIMEOUT_MARGIN = 5
+
+
+def wait_for_page_load_complete(driver, timeout=30, settle=0):
     """
     Wait for the page to be fully loaded and rendered.
     Uses multiple indicators to determine when a page is completely loaded.
     
+    The indicators are polled by a single async script in the page, so
+    waiting costs one WebDriver round trip however long the page takes.
+    
     Args:
         driver: Selenium WebDriver instance
         timeout: Maximum time to wait in seconds
+        settle: Extra seconds to wait once the page has loaded, for pages
+            that keep changing after their last frame is painted
         
     Returns:
         bool: True if page is loaded successfully
@@ -167,37 +626,22 @@ def wait_for_page_load_complete(driver, timeout=30):
     Raises:
         TimeoutException: If page doesn't load within timeout
     """
-    wait = WebDriverWait(driver, timeout)
+    # The script gives up by itself at the deadline; leave it time to report
+    # back before the driver's own script timeout (30 seconds by default) hits
+    script_timeout = timeout + _SCRIPT_TIMEOUT_MARGIN
+    if getattr(driver, "_script_timeout", None) != script_timeout:
+        driver.set_script_timeout(script_timeout)
+        driver._script_timeout = script_timeout
     
-    # Wait for document ready state
     try:
-        wait.until(lambda d: d.execute_script('return document.readyState') == 'complete')
+        loaded = driver.execute_async_script(_PAGE_SETTLED_SCRIPT, timeout)
     except TimeoutException:
+        # The script didn't report back at all; check the one required indicator directly
+        loaded = driver.execute_script("return document.readyState") == "complete"
+    if not loaded:
         raise TimeoutException("Page document.readyState didn't reach 'complete'")
     
-    # Wait for jQuery to be loaded and inactive (if present)
-    try:
-        wait.until(lambda d: d.execute_script(
-            'return typeof jQuery !== "undefined" ? jQuery.active === 0 : true'))
-    except Exception:
-        pass  # jQuery might not be present, which is fine
-    
-    # Wait for any animations to complete (common libraries)
-    try:
-        wait.until(lambda d: d.execute_script(
-            'return !document.querySelector(".loading, .animating, .spinner, [data-loading]")'))
-    except Exception:
-        pass  # No loading elements might be present, which is fine
-    
-    # Additional check for any network requests still in progress
-    try:
-        wait.until(lambda d: d.execute_script(
-            'return window.performance && performance.getEntriesByType("resource").filter(r => !r.responseEnd).length === 0'
-        ))
-    except Exception:
-        pass  # Performance API might not be supported
-        
-    # Wait a tiny bit for any final rendering
-    time.sleep(0.5)
+    if settle:
+        time.sleep(settle)
     
-    return True 
\ No newline at end of file
+    return True